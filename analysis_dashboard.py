@@ -6,108 +6,301 @@ View and analyze your collected data with charts and statistics
 
 import sqlite3
 import json
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
 from pathlib import Path
 import argparse
-from collections import Counter, defaultdict
+import sys
+from collections import Counter
 import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# How long cached summary stats stay fresh within a dashboard session (seconds)
+STATS_CACHE_TTL = 60
+
+# Words of 4+ characters in discovered content names (shorter tokens are noise)
+_WORD_RE = re.compile(r'\b\w{4,}\b')
+
+# Rows pulled per round-trip when streaming discovered content
+CONTENT_CHUNK_ROWS = 5000
+
+# Reader threads for the summary sections; WAL lets them query concurrently
+SUMMARY_WORKERS = 4
+
+# Statement text is kept constant so the connection's statement cache reuses
+# the prepared plans across menu invocations. Each summary section has its own
+# statement so a chart only pays for the aggregate it draws.
+TOTALS_SQL = """
+    SELECT COUNT(*), COALESCE(SUM(significance_score > 10), 0)
+    FROM changes
+    WHERE timestamp > ?
+"""
+
+TOP_ENDPOINTS_SQL = """
+    SELECT endpoint, COUNT(*) as count, AVG(significance_score) as avg_score
+    FROM changes
+    WHERE timestamp > ?
+    GROUP BY endpoint
+    ORDER BY count DESC
+    LIMIT ?
+"""
+
+CHANGE_TYPES_SQL = """
+    SELECT change_type, COUNT(*) as count
+    FROM changes
+    WHERE timestamp > ? AND change_type != 'unknown'
+    GROUP BY change_type
+    ORDER BY count DESC
+"""
+
+DAILY_ACTIVITY_SQL = """
+    SELECT CAST(strftime('%s', DATE(timestamp)) AS INTEGER) as date, COUNT(*) as changes,
+           AVG(significance_score) as avg_significance
+    FROM changes
+    WHERE timestamp > ?
+    GROUP BY date
+    ORDER BY date DESC
+"""
+
+CONTENT_SUMMARY_SQL = """
+    SELECT content_type, COUNT(DISTINCT name) as unique_items
+    FROM discovered_content
+    WHERE timestamp > ?
+    GROUP BY content_type
+    ORDER BY unique_items DESC
+"""
+
+# Unordered on purpose: per-type top items are selected in NumPy, which avoids
+# a full sort of the window inside SQLite. Unscored items rank as 0 so a NULL
+# never reaches the selection as NaN.
+CONTENT_ITEMS_SQL = """
+    SELECT name, content_type, COALESCE(confidence_score, 0) AS confidence_score, timestamp
+    FROM discovered_content
+    WHERE timestamp > ?
+"""
+
+TOTAL_CHANGES_SQL = "SELECT COUNT(*) FROM changes"
+TOTAL_CONTENT_SQL = "SELECT COUNT(*) FROM discovered_content"
+
+DATE_RANGE_SQL = """
+    SELECT MIN(timestamp) as first, MAX(timestamp) as last
+    FROM changes
+"""
+
+TOP_SCORES_SQL = """
+    SELECT endpoint, significance_score, timestamp
+    FROM changes
+    ORDER BY significance_score DESC
+    LIMIT 5
+"""
+
+# One row: average changes per active day plus the busiest day (latest on ties)
+TREND_SQL = """
+    WITH daily AS (
+        SELECT DATE(timestamp) AS day, COUNT(*) AS changes
+        FROM changes
+        WHERE timestamp > ?
+        GROUP BY day
+    )
+    SELECT AVG(changes) OVER () AS avg_daily, day, changes
+    FROM daily
+    ORDER BY changes DESC, day DESC
+    LIMIT 1
+"""
+
+def _top_k(confidence, timestamps, k=10):
+    """Indices of the k highest-confidence rows, newest first among ties"""
+    if len(confidence) > k:
+        # Partial selection: everything tied with the k-th best is a candidate
+        kth = np.partition(confidence, len(confidence) - k)[len(confidence) - k]
+        candidates = np.flatnonzero(confidence >= kth)
+    else:
+        candidates = np.arange(len(confidence))
+    order = np.lexsort((timestamps[candidates], confidence[candidates]))[::-1][:k]
+    return candidates[order]
 
 class EAFCAnalyzer:
-    def __init__(self, db_path="data/ea_fc_changes.db"):
-        self.db_path = Path(db_path)
+    def __init__(self, db_path=Path("data/ea_fc_changes.db"), dpi=150):
+        self.db_path = db_path if isinstance(db_path, Path) else Path(db_path)
         self.results_dir = Path("analysis_results")
         self.results_dir.mkdir(exist_ok=True)
         
-        # Set up plotting style
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
+        # Chart resolution; 150 DPI looks the same on screen as 300 at a quarter of the pixels
+        self.dpi = dpi
+        
+        # (query, days) -> (fetched_at, result) so back-to-back plots reuse recent results
+        self._stats_cache = {}
+        
+        # One connection per thread, opened lazily so a missing database is
+        # never created as a side effect
+        self._local = threading.local()
+        self._conns = []
+        self._conns_lock = threading.Lock()
+        
+        # Worker threads for the summary sections, started on first use
+        self._pool = None
+        
+        # (days, minute) -> ISO cutoff, shared by every query issued within the minute
+        self._cutoff_cache = {}
+        
+        # Checked once; only touch the schema if the dataminer has already created the DB
+        self.db_exists = self.db_path.exists()
+        if self.db_exists:
+            self.ensure_indexes()
+        
+        # Plotting style is applied on the first chart; report-only runs never load matplotlib
+        self._style_applied = False
         
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's database connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+    
+    def close(self):
+        """Stop the worker threads and close every database connection"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        with self._conns_lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
+        self._local = threading.local()
+    
+    def ensure_indexes(self):
+        """Create covering indexes for the time-windowed summary queries"""
+        try:
+            conn = self.get_connection()
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_changes_ts_sig_ep_ct
+                ON changes(timestamp, significance_score, endpoint, change_type)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_content_ts_type_name
+                ON discovered_content(timestamp, content_type, name)
+            """)
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Could not create analysis indexes: {e}")
+    
+    def _cutoff_iso(self, days):
+        """ISO timestamp N days ago, computed once per minute for each window"""
+        key = (days, int(time.time() // 60))
+        cutoff = self._cutoff_cache.get(key)
+        if cutoff is None:
+            # Older minutes can never be hit again
+            self._cutoff_cache = {k: v for k, v in self._cutoff_cache.items() if k[1] == key[1]}
+            cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+            self._cutoff_cache[key] = cutoff
+        return cutoff
+    
+    def _totals(self, days, cutoff=None):
+        """Total and high-significance (score > 10) change counts for N days"""
+        cutoff = cutoff or self._cutoff_iso(days)
+        total, high = self.get_connection().execute(TOTALS_SQL, (cutoff,)).fetchone()
+        return {'total_changes': total, 'high_significance': high}
+    
+    def _top_endpoints(self, days, cutoff=None, n=10):
+        """Most active endpoints with their average significance"""
+        cutoff = cutoff or self._cutoff_iso(days)
+        return pd.read_sql_query(TOP_ENDPOINTS_SQL, self.get_connection(),
+                                 params=(cutoff, n))
+    
+    def _change_types(self, days, cutoff=None):
+        """Change counts per detected type, excluding 'unknown'"""
+        cutoff = cutoff or self._cutoff_iso(days)
+        return pd.read_sql_query(CHANGE_TYPES_SQL, self.get_connection(),
+                                 params=(cutoff,))
+    
+    def _daily_activity(self, days, cutoff=None):
+        """Per-day change counts and average significance, newest first"""
+        cutoff = cutoff or self._cutoff_iso(days)
+        daily = pd.read_sql_query(DAILY_ACTIVITY_SQL, self.get_connection(),
+                                  params=(cutoff,))
+        daily['date'] = pd.to_datetime(daily['date'].astype('int64'), unit='s')
+        return daily
+    
+    def _content_types(self, days, cutoff=None):
+        """Unique discovered item names per content type"""
+        cutoff = cutoff or self._cutoff_iso(days)
+        return pd.read_sql_query(CONTENT_SUMMARY_SQL, self.get_connection(),
+                                 params=(cutoff,))
     
     def generate_summary_stats(self, days=30):
         """Generate summary statistics for the last N days"""
-        with self.get_connection() as conn:
-            # Get data from last N days
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-            
-            stats = {}
-            
-            # Total changes
-            stats['total_changes'] = conn.execute(
-                "SELECT COUNT(*) FROM changes WHERE timestamp > ?", 
-                (cutoff_date,)
-            ).fetchone()[0]
-            
-            # High significance changes
-            stats['high_significance'] = conn.execute(
-                "SELECT COUNT(*) FROM changes WHERE timestamp > ? AND significance_score > 10",
-                (cutoff_date,)
-            ).fetchone()[0]
-            
-            # Changes by endpoint
-            endpoint_data = conn.execute("""
-                SELECT endpoint, COUNT(*) as count, AVG(significance_score) as avg_score
-                FROM changes 
-                WHERE timestamp > ?
-                GROUP BY endpoint 
-                ORDER BY count DESC
-            """, (cutoff_date,)).fetchall()
-            
-            stats['top_endpoints'] = endpoint_data
-            
-            # Changes by type
-            type_data = conn.execute("""
-                SELECT change_type, COUNT(*) as count
-                FROM changes 
-                WHERE timestamp > ? AND change_type != 'unknown'
-                GROUP BY change_type 
-                ORDER BY count DESC
-            """, (cutoff_date,)).fetchall()
-            
-            stats['change_types'] = type_data
-            
-            # Discovered content
-            content_data = conn.execute("""
-                SELECT content_type, COUNT(DISTINCT name) as unique_items
-                FROM discovered_content 
-                WHERE timestamp > ?
-                GROUP BY content_type
-                ORDER BY unique_items DESC
-            """, (cutoff_date,)).fetchall()
-            
-            stats['content_discovered'] = content_data
-            
-            # Daily activity
-            daily_data = conn.execute("""
-                SELECT DATE(timestamp) as date, COUNT(*) as changes, 
-                       AVG(significance_score) as avg_significance
-                FROM changes 
-                WHERE timestamp > ?
-                GROUP BY DATE(timestamp)
-                ORDER BY date DESC
-            """, (cutoff_date,)).fetchall()
-            
-            stats['daily_activity'] = daily_data
-            
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=SUMMARY_WORKERS,
+                                            thread_name_prefix="summary")
+        
+        # Fix the cutoff up front and hand it to every section, so they all filter
+        # on the same window and the workers never touch the cutoff cache
+        cutoff = self._cutoff_iso(days)
+        
+        # Independent aggregates run side by side on per-thread connections, so
+        # the wall-clock cost is the slowest query rather than the sum
+        totals = self._pool.submit(self._totals, days, cutoff)
+        sections = {
+            'top_endpoints': self._pool.submit(self._top_endpoints, days, cutoff),
+            'change_types': self._pool.submit(self._change_types, days, cutoff),
+            'content_discovered': self._pool.submit(self._content_types, days, cutoff),
+            'daily_activity': self._pool.submit(self._daily_activity, days, cutoff),
+        }
+        
+        stats = totals.result()
+        for name, future in sections.items():
+            stats[name] = future.result()
         return stats
     
+    def get_trend_stats(self, days=7):
+        """Average daily changes and the busiest day, reduced inside SQLite"""
+        return self.get_connection().execute(TREND_SQL, (self._cutoff_iso(days),)).fetchone()
+    
+    def _cached(self, fetch, days):
+        """Return fetch(days), reusing a result from the last STATS_CACHE_TTL seconds"""
+        key = (fetch.__name__, days)
+        cached = self._stats_cache.get(key)
+        if cached and time.monotonic() - cached[0] < STATS_CACHE_TTL:
+            return cached[1]
+        
+        result = fetch(days)
+        self._stats_cache[key] = (time.monotonic(), result)
+        return result
+    
+    def _ensure_style(self):
+        """Import the plotting stack and set up the chart style on first use"""
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        if not self._style_applied:
+            plt.style.use('seaborn-v0_8')
+            sns.set_palette("husl")
+            self._style_applied = True
+        return plt
+    
     def plot_activity_timeline(self, days=30):
         """Create timeline plot of activity"""
-        stats = self.generate_summary_stats(days)
-        
-        if not stats['daily_activity']:
+        daily = self._cached(self._daily_activity, days)
+        if daily.empty:
             print("No data available for timeline plot")
             return
         
+        plt = self._ensure_style()
+        
         # Prepare data
-        dates = [datetime.strptime(row[0], '%Y-%m-%d') for row in stats['daily_activity']]
-        changes = [row[1] for row in stats['daily_activity']]
-        significance = [row[2] for row in stats['daily_activity']]
+        dates = daily['date']
+        changes = daily['changes']
+        significance = daily['avg_significance']
         
         # Create subplot
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
@@ -126,21 +319,24 @@ class EAFCAnalyzer:
         ax2.grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig(self.results_dir / f'activity_timeline_{days}d.png', dpi=300, bbox_inches='tight')
+        fig.savefig(self.results_dir / f'activity_timeline_{days}d.png', dpi=self.dpi, bbox_inches='tight')
         plt.show()
+        plt.close(fig)
     
     def plot_endpoint_analysis(self, days=30):
         """Analyze which endpoints are most active"""
-        stats = self.generate_summary_stats(days)
-        
-        if not stats['top_endpoints']:
+        top = self._cached(self._top_endpoints, days)
+        if top.empty:
             print("No endpoint data available")
             return
         
-        # Prepare data
-        endpoints = [row[0] for row in stats['top_endpoints'][:10]]
-        counts = [row[1] for row in stats['top_endpoints'][:10]]
-        avg_scores = [row[2] for row in stats['top_endpoints'][:10]]
+        plt = self._ensure_style()
+        
+        # Prepare data as plain arrays so matplotlib and the label loops skip
+        # the per-element Series machinery
+        endpoints = top['endpoint'].to_numpy()
+        counts = top['count'].to_numpy(dtype=np.int64)
+        avg_scores = top['avg_score'].to_numpy(dtype=np.float64)
         
         # Create subplots
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
@@ -166,22 +362,24 @@ class EAFCAnalyzer:
                     f'{score:.1f}', va='center', fontweight='bold')
         
         plt.tight_layout()
-        plt.savefig(self.results_dir / f'endpoint_analysis_{days}d.png', dpi=300, bbox_inches='tight')
+        fig.savefig(self.results_dir / f'endpoint_analysis_{days}d.png', dpi=self.dpi, bbox_inches='tight')
         plt.show()
+        plt.close(fig)
     
     def plot_content_discovery(self, days=30):
         """Show discovered content breakdown"""
-        stats = self.generate_summary_stats(days)
-        
-        if not stats['content_discovered']:
+        discovered = self._cached(self._content_types, days)
+        if discovered.empty:
             print("No content discovery data available")
             return
         
+        plt = self._ensure_style()
+        
         # Pie chart of content types
-        content_types = [row[0] for row in stats['content_discovered']]
-        counts = [row[1] for row in stats['content_discovered']]
+        content_types = discovered['content_type'].to_numpy()
+        counts = discovered['unique_items'].to_numpy(dtype=np.int64)
         
-        plt.figure(figsize=(10, 8))
+        fig = plt.figure(figsize=(10, 8))
         colors = plt.cm.Set3(range(len(content_types)))
         
         wedges, texts, autotexts = plt.pie(counts, labels=content_types, autopct='%1.1f%%',
@@ -195,106 +393,125 @@ class EAFCAnalyzer:
             autotext.set_color('white')
             autotext.set_fontweight('bold')
         
-        plt.savefig(self.results_dir / f'content_discovery_{days}d.png', dpi=300, bbox_inches='tight')
+        fig.savefig(self.results_dir / f'content_discovery_{days}d.png', dpi=self.dpi, bbox_inches='tight')
         plt.show()
+        plt.close(fig)
     
     def analyze_content_patterns(self, days=30):
         """Analyze patterns in discovered content"""
-        with self.get_connection() as conn:
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        conn = self.get_connection()
+        cutoff_date = self._cutoff_iso(days)
+        
+        # Stream discovered content in chunks so memory stays bounded by the chunk
+        # size plus the word vocabulary, building every summary in a single pass.
+        # Each type keeps its running top 10 as parallel name/confidence/timestamp columns.
+        type_counts = {}
+        top_items = {}
+        word_counter = Counter()
+        
+        chunks = pd.read_sql_query(CONTENT_ITEMS_SQL, conn, params=(cutoff_date,),
+                                   chunksize=CONTENT_CHUNK_ROWS)
+        for chunk in chunks:
+            for content_type, items in chunk.groupby('content_type', sort=False):
+                type_counts[content_type] = type_counts.get(content_type, 0) + len(items)
+                
+                names = items['name'].to_numpy()
+                confidence = items['confidence_score'].to_numpy()
+                timestamps = items['timestamp'].to_numpy(dtype=str)
+                if content_type in top_items:
+                    prev = top_items[content_type]
+                    names = np.concatenate((prev['name'], names))
+                    confidence = np.concatenate((prev['confidence'], confidence))
+                    timestamps = np.concatenate((prev['timestamp'], timestamps))
+                
+                keep = _top_k(confidence, timestamps)
+                top_items[content_type] = {
+                    'name': names[keep],
+                    'confidence': confidence[keep],
+                    'timestamp': timestamps[keep]
+                }
             
-            # Get all discovered content
-            content_data = conn.execute("""
-                SELECT name, content_type, confidence_score, timestamp
-                FROM discovered_content 
-                WHERE timestamp > ?
-                ORDER BY confidence_score DESC, timestamp DESC
-            """, (cutoff_date,)).fetchall()
-        
-        if not content_data:
+            # Common words in names, skipping short words at tokenization time so the
+            # top 10 really are the ten most common words of 4+ characters
+            words = chunk['name'].str.lower().str.findall(_WORD_RE).explode().dropna()
+            word_counter.update(words.value_counts().to_dict())
+        
+        if not type_counts:
             print("No content data to analyze")
             return
         
-        print(f"\n🔍 Content Pattern Analysis - Last {days} Days")
-        print("=" * 60)
-        
-        # Group by content type
-        by_type = defaultdict(list)
-        for name, content_type, confidence, timestamp in content_data:
-            by_type[content_type].append({
-                'name': name,
-                'confidence': confidence,
-                'timestamp': timestamp
-            })
-        
-        for content_type, items in by_type.items():
-            print(f"\n📋 {content_type} Items Found ({len(items)}):")
-            print("-" * 40)
+        # The whole analysis is buffered and written to stdout in one call
+        out = [f"\n🔍 Content Pattern Analysis - Last {days} Days\n", "=" * 60, "\n"]
+        
+        # Types with the strongest single finding first
+        ordered_types = sorted(
+            top_items,
+            key=lambda t: (top_items[t]['confidence'][0], top_items[t]['timestamp'][0]),
+            reverse=True
+        )
+        
+        for content_type in ordered_types:
+            top = top_items[content_type]
+            out.append(f"\n📋 {content_type} Items Found ({type_counts[content_type]}):\n")
+            out.append("-" * 40 + "\n")
             
             # Show top items by confidence
-            sorted_items = sorted(items, key=lambda x: x['confidence'], reverse=True)
-            for item in sorted_items[:10]:  # Top 10
-                print(f"  • {item['name']} (Confidence: {item['confidence']}%)")
-                print(f"    Detected: {item['timestamp'][:19]}")
+            for name, confidence, timestamp in zip(top['name'], top['confidence'], top['timestamp']):
+                out.append(f"  • {name} (Confidence: {confidence}%)\n")
+                out.append(f"    Detected: {timestamp[:19]}\n")
         
         # Look for naming patterns
-        print(f"\n🎯 Pattern Analysis:")
-        print("-" * 40)
-        
-        all_names = [item[0] for item in content_data]
-        
-        # Common words in names
-        word_counter = Counter()
-        for name in all_names:
-            words = re.findall(r'\b\w+\b', name.lower())
-            word_counter.update(words)
+        out.append(f"\n🎯 Pattern Analysis:\n")
+        out.append("-" * 40 + "\n")
         
-        print("Most common words in content names:")
+        out.append("Most common words in content names:\n")
         for word, count in word_counter.most_common(10):
-            if len(word) > 3:  # Skip short words
-                print(f"  • '{word}': {count} times")
+            out.append(f"  • '{word}': {count} times\n")
+        
+        sys.stdout.write(''.join(out))
     
     def export_weekly_report(self):
         """Generate comprehensive weekly report"""
-        stats = self.generate_summary_stats(7)  # Last 7 days
+        stats = self._cached(self.generate_summary_stats, 7)  # Last 7 days
         
         report_path = self.results_dir / f"weekly_analysis_{datetime.now().strftime('%Y%m%d')}.md"
         
-        with open(report_path, 'w') as f:
-            f.write(f"# EA FC Weekly Analysis Report\n")
-            f.write(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            
-            f.write(f"## 📊 Summary Statistics (Last 7 Days)\n")
-            f.write(f"- **Total Changes Detected**: {stats['total_changes']}\n")
-            f.write(f"- **High Significance Changes**: {stats['high_significance']}\n")
-            f.write(f"- **Success Rate**: {(stats['high_significance']/max(stats['total_changes'],1)*100):.1f}% high-value detection\n\n")
-            
-            if stats['top_endpoints']:
-                f.write(f"## 🎯 Most Active Endpoints\n")
-                for endpoint, count, avg_score in stats['top_endpoints'][:5]:
-                    f.write(f"- **{endpoint}**: {count} changes (avg score: {avg_score:.1f})\n")
-                f.write("\n")
-            
-            if stats['change_types']:
-                f.write(f"## 📋 Content Types Detected\n")
-                for change_type, count in stats['change_types']:
-                    f.write(f"- **{change_type}**: {count} instances\n")
-                f.write("\n")
-            
-            if stats['content_discovered']:
-                f.write(f"## 🔍 Content Discovery Summary\n")
-                for content_type, count in stats['content_discovered']:
-                    f.write(f"- **{content_type}**: {count} unique items\n")
-                f.write("\n")
-            
-            f.write(f"## 📈 Trend Analysis\n")
-            if stats['daily_activity']:
-                avg_daily = sum(row[1] for row in stats['daily_activity']) / len(stats['daily_activity'])
-                f.write(f"- **Average Daily Changes**: {avg_daily:.1f}\n")
-                
-                most_active_day = max(stats['daily_activity'], key=lambda x: x[1])
-                f.write(f"- **Most Active Day**: {most_active_day[0]} ({most_active_day[1]} changes)\n")
-            
+        parts = []
+        parts.append(f"# EA FC Weekly Analysis Report\n")
+        parts.append(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        
+        parts.append(f"## 📊 Summary Statistics (Last 7 Days)\n")
+        parts.append(f"- **Total Changes Detected**: {stats['total_changes']}\n")
+        parts.append(f"- **High Significance Changes**: {stats['high_significance']}\n")
+        parts.append(f"- **Success Rate**: {(stats['high_significance']/max(stats['total_changes'],1)*100):.1f}% high-value detection\n\n")
+        
+        if not stats['top_endpoints'].empty:
+            parts.append(f"## 🎯 Most Active Endpoints\n")
+            for endpoint, count, avg_score in stats['top_endpoints'].head(5).itertuples(index=False):
+                parts.append(f"- **{endpoint}**: {count} changes (avg score: {avg_score:.1f})\n")
+            parts.append("\n")
+        
+        if not stats['change_types'].empty:
+            parts.append(f"## 📋 Content Types Detected\n")
+            for change_type, count in stats['change_types'].itertuples(index=False):
+                parts.append(f"- **{change_type}**: {count} instances\n")
+            parts.append("\n")
+        
+        if not stats['content_discovered'].empty:
+            parts.append(f"## 🔍 Content Discovery Summary\n")
+            for content_type, count in stats['content_discovered'].itertuples(index=False):
+                parts.append(f"- **{content_type}**: {count} unique items\n")
+            parts.append("\n")
+        
+        parts.append(f"## 📈 Trend Analysis\n")
+        trend = self.get_trend_stats(7)
+        if trend:
+            avg_daily, busiest_day, busiest_count = trend
+            parts.append(f"- **Average Daily Changes**: {avg_daily:.1f}\n")
+            parts.append(f"- **Most Active Day**: {busiest_day} ({busiest_count} changes)\n")
+        
+        report_path.write_text(''.join(parts), encoding='utf-8')
+        
         print(f"📄 Weekly report saved to: {report_path}")
         return report_path
     
@@ -344,59 +561,56 @@ class EAFCAnalyzer:
     
     def show_database_stats(self):
         """Show database statistics"""
-        with self.get_connection() as conn:
-            print("\n📊 Database Statistics")
-            print("-" * 40)
-            
-            # Total records
-            total_changes = conn.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
-            total_content = conn.execute("SELECT COUNT(*) FROM discovered_content").fetchone()[0]
-            
-            print(f"Total Changes Recorded: {total_changes}")
-            print(f"Total Content Items: {total_content}")
-            
-            # Date range
-            date_range = conn.execute("""
-                SELECT MIN(timestamp) as first, MAX(timestamp) as last
-                FROM changes
-            """).fetchone()
-            
-            if date_range[0]:
-                print(f"Data Range: {date_range[0][:10]} to {date_range[1][:10]}")
-            
-            # Top significance scores
-            top_scores = conn.execute("""
-                SELECT endpoint, significance_score, timestamp
-                FROM changes 
-                ORDER BY significance_score DESC
-                LIMIT 5
-            """).fetchall()
-            
-            print(f"\nTop Significance Scores:")
-            for endpoint, score, timestamp in top_scores:
-                print(f"  • {score}: {endpoint} ({timestamp[:19]})")
+        conn = self.get_connection()
+        out = ["\n📊 Database Statistics\n", "-" * 40, "\n"]
+        
+        # Total records
+        total_changes = conn.execute(TOTAL_CHANGES_SQL).fetchone()[0]
+        total_content = conn.execute(TOTAL_CONTENT_SQL).fetchone()[0]
+        
+        out.append(f"Total Changes Recorded: {total_changes}\n")
+        out.append(f"Total Content Items: {total_content}\n")
+        
+        # Date range
+        date_range = conn.execute(DATE_RANGE_SQL).fetchone()
+        
+        if date_range[0]:
+            out.append(f"Data Range: {date_range[0][:10]} to {date_range[1][:10]}\n")
+        
+        # Top significance scores
+        top_scores = conn.execute(TOP_SCORES_SQL).fetchall()
+        
+        out.append(f"\nTop Significance Scores:\n")
+        for endpoint, score, timestamp in top_scores:
+            out.append(f"  • {score}: {endpoint} ({timestamp[:19]})\n")
+        
+        sys.stdout.write(''.join(out))
 
 def main():
     parser = argparse.ArgumentParser(description="EA FC DataMiner Analysis Dashboard")
-    parser.add_argument("--db", default="data/ea_fc_changes.db", help="Database path")
+    parser.add_argument("--db", type=Path, default=Path("data/ea_fc_changes.db"), help="Database path")
     parser.add_argument("--days", type=int, default=30, help="Days to analyze")
     parser.add_argument("--report", action="store_true", help="Generate report only")
+    parser.add_argument("--dpi", type=int, default=150, help="Resolution of saved charts")
     
     args = parser.parse_args()
     
-    analyzer = EAFCAnalyzer(args.db)
+    analyzer = EAFCAnalyzer(args.db, dpi=args.dpi)
     
-    if not analyzer.db_path.exists():
+    if not analyzer.db_exists:
         print(f"❌ Database not found: {analyzer.db_path}")
         print("Make sure the main dataminer has been running to collect data.")
         return
     
-    if args.report:
-        # Just generate report and exit
-        analyzer.export_weekly_report()
-    else:
-        # Interactive mode
-        analyzer.interactive_analysis()
+    try:
+        if args.report:
+            # Just generate report and exit
+            analyzer.export_weekly_report()
+        else:
+            # Interactive mode
+            analyzer.interactive_analysis()
+    finally:
+        analyzer.close()
 
 if __name__ == "__main__":
     main()
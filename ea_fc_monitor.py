@@ -1,10 +1,14 @@
 import requests
 import hashlib
 import json
+import pickle
 import time
 import os
 import csv
-from datetime import datetime, timedelta
+import gzip
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 import asyncio
 import aiohttp
 from pathlib import Path
@@ -12,6 +16,39 @@ import logging
 import re
 from typing import Dict, List, Optional, Set
 import sqlite3
+from collections import OrderedDict
+
+# Optional non-blocking DNS resolver (c-ares) for aiohttp
+try:
+    import aiodns
+    HAS_AIODNS = True
+except ImportError:
+    HAS_AIODNS = False
+
+# aiohttp only decompresses 'br' responses when a Brotli decoder is installed
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Optional faster JSON encoder for the database columns
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional single-pass pattern prefilter
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+# Non-ASCII letters Python's IGNORECASE folds onto ASCII ones; Hyperscan's caseless
+# mode does not, so content containing them skips the prefilter
+_CASEFOLD_EXTRAS_RE = re.compile('[\u0130\u0131\u017f\u212a]')
 
 # Configure logging
 logging.basicConfig(
@@ -23,15 +60,119 @@ logging.basicConfig(
     ]
 )
 
+# Script tags in the web app page
+_JS_SRC_RE = re.compile(r'src=["\']([^"\']*\.js[^"\']*)["\']')
+
+# Quoted absolute URLs and /api/ paths, found in one pass and filtered by
+# is_api_candidate. The closing quote is only looked ahead at so it can still
+# open the next string.
+_DISCOVER_RE = re.compile(r'"(https://[^"]*|/api/[^"]*)(?=")')
+
+def is_api_candidate(url: str) -> bool:
+    """Whether a quoted URL from the web app looks like an EA FC API endpoint"""
+    if url.startswith('/api/') or 'fut' in url or 'ultimate-team' in url:
+        return True
+    # An ea.com URL with 'api' somewhere after the host
+    host = url.find('.ea.com')
+    return host != -1 and url.find('api', host + len('.ea.com')) != -1
+
+def canonical_url(url: str) -> str:
+    """URL without fragment, query string or trailing slash, for duplicate checks"""
+    return url.split('#', 1)[0].split('?', 1)[0].rstrip('/')
+
+def dump_json(data) -> str:
+    """Serialize to a JSON string, with orjson when it is installed"""
+    if HAS_ORJSON:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data)
+
+def retry_after_seconds(headers, default: float = 30.0) -> float:
+    """Seconds to wait after a 429, from Retry-After or X-RateLimit-Reset"""
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            # HTTP-date form
+            when = parsedate_to_datetime(retry_after)
+            return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    
+    reset = headers.get('X-RateLimit-Reset')
+    if reset:
+        try:
+            reset = float(reset)
+        except ValueError:
+            return default
+        # Either an epoch timestamp or a number of seconds from now
+        if reset > 1e9:
+            reset -= time.time()
+        return max(0.0, reset)
+    
+    return default
+
+class _Bucket:
+    """Token bucket for one host: `rate` requests per second, bursts up to `capacity`"""
+    
+    def __init__(self, rate: float = 1.0, capacity: float = 4.0):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Take a token, sleeping only while the bucket is empty or paused"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def throttle(self, delay: float):
+        """Pause the host for `delay` seconds after a 429 and halve its rate"""
+        now = time.monotonic()
+        self.paused_until = max(self.paused_until, now + delay)
+        self.rate = max(self.base_rate / 16, self.rate / 2)
+        self.tokens = 1.0  # One retry is allowed as soon as the pause ends
+        self.last_refill = self.paused_until
+    
+    def recover(self):
+        """Creep back towards the normal rate after a successful request"""
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate * 1.25)
+
 class EAFCDataMiner:
     def __init__(self, check_interval=1200):  # 20 minutes default
         self.check_interval = check_interval
-        self.known_hashes = {}
+        self.known_hashes = OrderedDict()  # Least recently checked first
+        self._hashes_dirty = False  # Only rewrite the hash file when something changed
+        self._cycle_previous = {}  # endpoint -> hash entry before this cycle's change
         self.session = None
         self.results_dir = Path("results")
         self.changes_dir = Path("changes")
         self.exports_dir = Path("exports")
         self.db_path = Path("data/ea_fc_changes.db")
+        self.max_concurrent_checks = 8  # Endpoint checks in flight per cycle
+        self.max_endpoints = 200  # Cap on monitored endpoints and remembered hashes
+        self._buckets: Dict[str, _Bucket] = {}  # Request rate limits per host
+        
+        # Today's CSV export, appended to as changes are saved
+        self._csv_date = None
+        self._csv_file = None
+        self._csv_writer = None
         
         # Create directories
         for dir_path in [self.results_dir, self.changes_dir, self.exports_dir, Path("data")]:
@@ -41,7 +182,7 @@ class EAFCDataMiner:
         self.init_database()
         
         # Specific EA FC endpoints (these are the key ones to find)
-        self.endpoints = {
+        self.endpoints = OrderedDict({
             # Main web app files
             "web_app_main": "https://www.ea.com/fifa/ultimate-team/web-app/",
             "web_app_config": "https://www.ea.com/fifa/ultimate-team/web-app/config/config.json",
@@ -60,7 +201,12 @@ class EAFCDataMiner:
             "packs_endpoint": "https://www.ea.com/fifa/ultimate-team/api/packs",
             "players_endpoint": "https://www.ea.com/fifa/ultimate-team/api/players",
             "market_endpoint": "https://www.ea.com/fifa/ultimate-team/api/market",
-        }
+        })
+        # Only discovered endpoints are ever evicted
+        self._builtin_endpoints = frozenset(self.endpoints)
+        
+        # Canonical form of every monitored URL, so discovery skips near-duplicates in O(1)
+        self._endpoint_urls = {canonical_url(url) for url in self.endpoints.values()}
         
         # Enhanced keyword detection
         self.content_patterns = {
@@ -100,10 +246,79 @@ class EAFCDataMiner:
                 r'player.*pick'
             ]
         }
+        
+        # Look for specific high-value indicators
+        self.high_value_terms = [
+            'toty', 'team of the year',
+            'tots', 'team of the season', 
+            'fut champions', 'weekend league',
+            'icon', 'hero', 'flashback'
+        ]
+        
+        # Compile every pattern once; the analysis path reuses them per change
+        self._compiled_patterns = {
+            category: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for category, patterns in self.content_patterns.items()
+        }
+        self._safe_name_re = re.compile(r'[^\w\-_]')
+        
+        # With Hyperscan available, one scan over the content reports which
+        # patterns and high-value terms occur at all, so findall only runs for
+        # those and the term checks come for free. Targets are the compiled
+        # patterns followed by the term strings.
+        self._hs_targets = [p for patterns in self._compiled_patterns.values() for p in patterns]
+        self._hs_targets.extend(self.high_value_terms)
+        self._hs_db = None
+        if HAS_HYPERSCAN:
+            self.init_prefilter()
+
+    def init_prefilter(self):
+        """Compile the content patterns and high-value terms into one Hyperscan database"""
+        flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH |
+                 hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[
+                    (t.pattern if isinstance(t, re.Pattern) else re.escape(t)).encode('utf-8')
+                    for t in self._hs_targets
+                ],
+                ids=list(range(len(self._hs_targets))),
+                elements=len(self._hs_targets),
+                flags=flags
+            )
+            self._hs_scratch = hyperscan.Scratch(db)
+            self._hs_db = db
+        except hyperscan.error as e:
+            logging.warning(f"⚠️ Hyperscan prefilter unavailable, using plain regex: {e}")
+
+    def matching_patterns(self, content: str) -> Optional[Set]:
+        """Patterns and high-value terms that occur in content, or None when everything must run"""
+        if self._hs_db is None or _CASEFOLD_EXTRAS_RE.search(content):
+            return None
+        
+        try:
+            data = content.encode('utf-8')
+        except UnicodeEncodeError:
+            # Hyperscan's UTF-8 mode needs valid UTF-8 (no lone surrogates)
+            return None
+        
+        found = set()
+        def on_match(pattern_id, start, end, flags, context):
+            found.add(self._hs_targets[pattern_id])
+        
+        self._hs_db.scan(data, match_event_handler=on_match, scratch=self._hs_scratch)
+        return found
 
     def init_database(self):
-        """Initialize SQLite database for change tracking"""
-        with sqlite3.connect(self.db_path) as conn:
+        """Open the long-lived SQLite connection and create the tracking tables"""
+        self.db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("PRAGMA temp_store=MEMORY")
+        self.db.execute("PRAGMA mmap_size=268435456")
+        
+        with self.db as conn:
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS changes (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -128,14 +343,42 @@ class EAFCDataMiner:
                     confidence_score INTEGER
                 )
             ''')
+            
+            # Indexes so the daily report seeks today's rows instead of scanning.
+            # Both match the ones the analysis dashboard creates, so the two tools
+            # share them rather than maintaining a second copy on every insert.
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_changes_ts_sig_ep_ct
+                ON changes(timestamp, significance_score, endpoint, change_type)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_content_ts_type_name
+                ON discovered_content(timestamp, content_type, name)
+            ''')
+
+    def close(self):
+        """Close the database connection and today's CSV export"""
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+            self._csv_date = None
 
     async def initialize_session(self):
         """Initialize aiohttp session with EA-friendly headers"""
+        # One session for the miner's lifetime; keep its pooled connections if called again
+        if self.session is not None and not self.session.closed:
+            return
+        
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'application/json, text/plain, */*',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            # Only advertise Brotli when responses using it can be decoded
+            'Accept-Encoding': 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate',
             'Connection': 'keep-alive',
             'Sec-Fetch-Dest': 'empty',
             'Sec-Fetch-Mode': 'cors',
@@ -146,10 +389,15 @@ class EAFCDataMiner:
         }
         
         timeout = aiohttp.ClientTimeout(total=45)
+        # Resolve on the event loop with aiodns when installed instead of a threadpool getaddrinfo
+        resolver = aiohttp.resolver.AsyncResolver() if HAS_AIODNS else None
         connector = aiohttp.TCPConnector(
-            limit=3,  # Very conservative
-            ttl_dns_cache=300,
+            limit=64,
+            limit_per_host=4,  # Conservative per EA host; different hosts proceed in parallel
+            keepalive_timeout=75,  # Keep connections warm across bursts of checks
+            ttl_dns_cache=600,
             use_dns_cache=True,
+            resolver=resolver,
         )
         
         self.session = aiohttp.ClientSession(
@@ -158,56 +406,136 @@ class EAFCDataMiner:
             connector=connector
         )
 
-    def load_known_hashes(self, filename="data/known_hashes.json"):
+    def load_known_hashes(self, filename="data/known_hashes.pkl"):
         """Load previously recorded file hashes"""
+        self._hashes_dirty = False
         try:
-            with open(filename, 'r') as f:
-                self.known_hashes = json.load(f)
+            with open(filename, 'rb') as f:
+                self.known_hashes = OrderedDict(pickle.load(f))
                 logging.info(f"Loaded {len(self.known_hashes)} known hashes")
         except FileNotFoundError:
-            self.known_hashes = {}
+            self.known_hashes = self.load_legacy_hashes()
+            # Rewrite in the binary format on the first save
+            self._hashes_dirty = bool(self.known_hashes)
+
+    def load_legacy_hashes(self, filename="data/known_hashes.json") -> Dict:
+        """Read hashes from the older JSON file, which stored hex digests"""
+        try:
+            with open(filename, 'r') as f:
+                legacy = json.load(f)
+        except FileNotFoundError:
             logging.info("No previous hashes found, starting fresh")
+            return OrderedDict()
+        
+        known_hashes = OrderedDict()
+        for name, entry in legacy.items():
+            # The oldest files stored the bare hash string per endpoint
+            entry = dict(entry) if isinstance(entry, dict) else {'hash': entry}
+            entry['hash'] = bytes.fromhex(entry['hash'])
+            known_hashes[name] = entry
+        logging.info(f"Loaded {len(known_hashes)} known hashes from {filename}")
+        return known_hashes
+
+    def save_known_hashes(self, filename="data/known_hashes.pkl"):
+        """Save current file hashes and HTTP validators"""
+        # Write-then-rename so a crash mid-save never leaves a truncated file
+        tmp_path = f"{filename}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.known_hashes, f, protocol=5)
+        os.replace(tmp_path, filename)
+        self._hashes_dirty = False
 
-    def save_known_hashes(self, filename="data/known_hashes.json"):
-        """Save current file hashes"""
-        with open(filename, 'w') as f:
-            json.dump(self.known_hashes, f, indent=2)
+    def decode_body(self, body: bytes, charset: Optional[str]) -> str:
+        """Decode a response body, falling back to UTF-8 for missing or unknown charsets"""
+        try:
+            return body.decode(charset or 'utf-8', 'replace')
+        except LookupError:
+            return body.decode('utf-8', 'replace')
 
-    def get_file_hash(self, content: str) -> str:
-        """Generate SHA256 hash of content"""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    def remember_hash(self, name: str, content_hash: bytes, response):
+        """Record an endpoint's body hash and any validators for conditional GETs"""
+        entry = {'hash': content_hash}
+        if response.headers.get('ETag'):
+            entry['etag'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            entry['last_modified'] = response.headers['Last-Modified']
+        
+        if self.known_hashes.get(name) != entry:
+            self.known_hashes[name] = entry
+            self.known_hashes.move_to_end(name)
+            self._hashes_dirty = True
+            # Forget the least recently checked endpoints beyond the cap
+            while len(self.known_hashes) > self.max_endpoints:
+                self.known_hashes.popitem(last=False)
 
     async def check_endpoint(self, name: str, url: str) -> Optional[Dict]:
         """Check a single endpoint for changes with enhanced error handling"""
         try:
-            # Rate limiting - wait between requests
-            await asyncio.sleep(3)
+            # Revalidate with the stored validators so unchanged endpoints answer 304 without a body
+            known = self.known_hashes.get(name)
+            if known and next(reversed(self.known_hashes)) != name:
+                self.known_hashes.move_to_end(name)
+                # The saved order is what eviction uses after a restart, so it counts as a change
+                self._hashes_dirty = True
+            request_headers = {}
+            if known and known.get('etag'):
+                request_headers['If-None-Match'] = known['etag']
+            if known and known.get('last_modified'):
+                request_headers['If-Modified-Since'] = known['last_modified']
             
-            async with self.session.get(url) as response:
+            bucket = self.bucket_for(url)
+            await bucket.acquire()
+            async with self.session.get(url, headers=request_headers) as response:
+                if response.status in (200, 304):
+                    bucket.recover()
+                
+                if response.status == 304:
+                    return None
+                
                 if response.status == 200:
-                    content = await response.text()
-                    current_hash = self.get_file_hash(content)
+                    logging.debug(f"{name}: Content-Encoding {response.headers.get('Content-Encoding', 'identity')}")
                     
-                    if name not in self.known_hashes:
-                        self.known_hashes[name] = current_hash
+                    # Hash the body as it streams in; unchanged endpoints (the
+                    # common case) are never decoded to text at all
+                    digest = hashlib.sha256()
+                    body = bytearray()
+                    async for chunk in response.content.iter_chunked(65536):
+                        digest.update(chunk)
+                        body.extend(chunk)
+                    current_hash = digest.digest()
+                    
+                    if known and known['hash'] == current_hash:
+                        # Unchanged, but the server may have issued new validators
+                        self.remember_hash(name, current_hash, response)
+                        return None
+                    
+                    content = self.decode_body(body, response.charset)
+                    
+                    if not known:
+                        self.remember_hash(name, current_hash, response)
                         logging.info(f"✅ New endpoint tracked: {name}")
                         # Save initial content for comparison
                         await self.save_initial_content(name, content)
                         return None
                     
-                    if self.known_hashes[name] != current_hash:
-                        logging.warning(f"🚨 CHANGE DETECTED: {name}")
-                        change_data = await self.process_change(name, url, content)
-                        self.known_hashes[name] = current_hash
-                        return change_data
+                    logging.warning(f"🚨 CHANGE DETECTED: {name}")
+                    if name in self.endpoints:
+                        # Endpoints that change stay monitored longest
+                        self.endpoints.move_to_end(name)
+                    change_data = await self.process_change(name, url, content, current_hash)
+                    # Kept so the change can be detected again if the cycle's save fails
+                    self._cycle_previous[name] = known
+                    self.remember_hash(name, current_hash, response)
+                    return change_data
                         
                 elif response.status == 404:
                     logging.warning(f"❌ Endpoint not found: {name}")
                 elif response.status == 403:
                     logging.warning(f"🔒 Access denied: {name}")
                 elif response.status == 429:
-                    logging.warning(f"⏰ Rate limited: {name} - increasing delay")
-                    await asyncio.sleep(30)  # Back off on rate limiting
+                    delay = retry_after_seconds(response.headers)
+                    logging.warning(f"⏰ Rate limited: {name} - pausing {urlsplit(url).netloc} for {delay:.0f}s")
+                    bucket.throttle(delay)
                 else:
                     logging.warning(f"⚠️ HTTP {response.status} for {name}")
                     
@@ -218,35 +546,58 @@ class EAFCDataMiner:
         
         return None
 
+    def bucket_for(self, url: str) -> _Bucket:
+        """Rate limit bucket for the URL's host, so separate hosts never wait on each other"""
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket()
+        return bucket
+
+    def write_text(self, filepath: Path, *parts: str):
+        """Write text parts to a file; run via asyncio.to_thread to keep disk IO off the event loop"""
+        with open(filepath, 'w', encoding='utf-8') as f:
+            for part in parts:
+                f.write(part)
+
+    def write_snapshot(self, filepath: Path, *parts: str):
+        """Write a gzip-compressed content snapshot; run via asyncio.to_thread"""
+        # Level 3 gets most of the gain on JSON and JS at a fraction of the CPU of level 9
+        with gzip.open(filepath, 'wt', encoding='utf-8', compresslevel=3) as f:
+            for part in parts:
+                f.write(part)
+
     async def save_initial_content(self, name: str, content: str):
         """Save initial content for new endpoints"""
         timestamp = datetime.now()
-        filename = f"initial_{timestamp.strftime('%Y%m%d_%H%M%S')}_{name}.txt"
+        filename = f"initial_{timestamp.strftime('%Y%m%d_%H%M%S')}_{name}.txt.gz"
         filepath = self.changes_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"Initial Content - {name}\n")
-            f.write(f"Timestamp: {timestamp}\n")
-            f.write("-" * 80 + "\n")
-            f.write(content)
+        header = (
+            f"Initial Content - {name}\n"
+            f"Timestamp: {timestamp}\n"
+            + "-" * 80 + "\n"
+        )
+        await asyncio.to_thread(self.write_snapshot, filepath, header, content)
 
-    async def process_change(self, name: str, url: str, content: str) -> Dict:
+    async def process_change(self, name: str, url: str, content: str, content_hash: bytes) -> Dict:
         """Process detected changes with advanced analysis"""
         timestamp = datetime.now()
         
         # Save raw content with better naming
-        safe_name = re.sub(r'[^\w\-_]', '_', name)
-        filename = f"{timestamp.strftime('%Y%m%d_%H%M%S')}_{safe_name}.txt"
+        safe_name = self._safe_name_re.sub('_', name)
+        filename = f"{timestamp.strftime('%Y%m%d_%H%M%S')}_{safe_name}.txt.gz"
         filepath = self.changes_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"🔄 CONTENT CHANGE DETECTED\n")
-            f.write(f"Endpoint: {name}\n")
-            f.write(f"URL: {url}\n")
-            f.write(f"Timestamp: {timestamp}\n")
-            f.write(f"Content Length: {len(content)} characters\n")
-            f.write("=" * 80 + "\n")
-            f.write(content)
+        header = (
+            f"🔄 CONTENT CHANGE DETECTED\n"
+            f"Endpoint: {name}\n"
+            f"URL: {url}\n"
+            f"Timestamp: {timestamp}\n"
+            f"Content Length: {len(content)} characters\n"
+            + "=" * 80 + "\n"
+        )
+        await asyncio.to_thread(self.write_snapshot, filepath, header, content)
 
         # Enhanced content analysis
         analysis = await self.analyze_content_advanced(content)
@@ -254,6 +605,7 @@ class EAFCDataMiner:
         change_data = {
             'timestamp': timestamp.isoformat(),
             'endpoint': name,
+            'content_hash': content_hash.hex(),  # SHA256 of the full body, as used for change detection
             'url': url,
             'filename': filename,
             'analysis': analysis,
@@ -261,9 +613,6 @@ class EAFCDataMiner:
             'content_preview': content[:500] + "..." if len(content) > 500 else content
         }
         
-        # Save to database
-        await self.save_to_database(change_data)
-        
         # Generate immediate alert if high significance
         if analysis['significance_score'] > 10:
             await self.generate_alert(change_data)
@@ -283,24 +632,29 @@ class EAFCDataMiner:
         }
         
         # Pattern matching for each content type
-        for category, patterns in self.content_patterns.items():
-            matches = []
+        active = self.matching_patterns(content)
+        for category, patterns in self._compiled_patterns.items():
+            # Unique matches go straight into a set; the score still counts every occurrence
+            unique = set()
+            match_count = 0
             for pattern in patterns:
-                found = re.findall(pattern, content, re.IGNORECASE)
-                matches.extend(found)
+                if active is None or pattern in active:
+                    found = pattern.findall(content)
+                    unique.update(found)
+                    match_count += len(found)
             
             if category == 'sbc_indicators':
-                analysis['found_sbcs'] = list(set(matches))
-                analysis['significance_score'] += len(matches) * 5
+                analysis['found_sbcs'] = list(unique)
+                analysis['significance_score'] += match_count * 5
             elif category == 'promo_indicators':
-                analysis['found_promos'] = list(set(matches))
-                analysis['significance_score'] += len(matches) * 8
+                analysis['found_promos'] = list(unique)
+                analysis['significance_score'] += match_count * 8
             elif category == 'player_indicators':
-                analysis['found_players'] = list(set(matches))
-                analysis['significance_score'] += len(matches) * 2
+                analysis['found_players'] = list(unique)
+                analysis['significance_score'] += match_count * 2
             elif category == 'pack_indicators':
-                analysis['found_packs'] = list(set(matches))
-                analysis['significance_score'] += len(matches) * 3
+                analysis['found_packs'] = list(unique)
+                analysis['significance_score'] += match_count * 3
         
         # Determine change type and confidence
         if analysis['found_sbcs']:
@@ -316,62 +670,92 @@ class EAFCDataMiner:
             analysis['change_type'] = 'player_update'
             analysis['confidence'] = 60
         
-        # Look for specific high-value indicators
-        high_value_terms = [
-            'toty', 'team of the year',
-            'tots', 'team of the season', 
-            'fut champions', 'weekend league',
-            'icon', 'hero', 'flashback'
-        ]
-        
-        content_lower = content.lower()
-        for term in high_value_terms:
-            if term in content_lower:
-                analysis['significance_score'] += 15
-                analysis['confidence'] = min(95, analysis['confidence'] + 10)
+        # Each high-value term counts once. The prefilter scan already found them;
+        # otherwise plain substring tests on a lowered copy are the fastest check
+        if active is None:
+            content_lower = content.lower()
+            terms_found = [term for term in self.high_value_terms if term in content_lower]
+        else:
+            terms_found = [term for term in self.high_value_terms if term in active]
+        if terms_found:
+            analysis['significance_score'] += 15 * len(terms_found)
+            analysis['confidence'] = min(95, analysis['confidence'] + 10 * len(terms_found))
         
         return analysis
 
-    async def save_to_database(self, change_data: Dict):
-        """Save change data to SQLite database"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                INSERT INTO changes 
-                (timestamp, endpoint, change_type, significance_score, content_hash, extracted_data, filename)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+    async def save_to_database(self, changes: List[Dict]):
+        """Save a cycle's changes to SQLite in one transaction"""
+        change_rows = []
+        content_rows = []
+        for change_data in changes:
+            analysis = change_data['analysis']
+            change_rows.append((
                 change_data['timestamp'],
                 change_data['endpoint'],
-                change_data['analysis']['change_type'],
-                change_data['analysis']['significance_score'],
-                self.get_file_hash(change_data['content_preview']),
-                json.dumps(change_data['analysis']),
+                analysis['change_type'],
+                analysis['significance_score'],
+                change_data['content_hash'],
+                dump_json(analysis),
                 change_data['filename']
             ))
             
             # Save discovered content items
-            analysis = change_data['analysis']
+            details = dump_json({'type': 'sbc', 'source': change_data['endpoint']})
             for sbc in analysis['found_sbcs'][:5]:  # Limit to top 5
-                conn.execute('''
-                    INSERT INTO discovered_content 
-                    (timestamp, content_type, name, details, endpoint, confidence_score)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
+                content_rows.append((
                     change_data['timestamp'],
                     'SBC',
                     str(sbc),
-                    json.dumps({'type': 'sbc', 'source': change_data['endpoint']}),
+                    details,
                     change_data['endpoint'],
                     analysis['confidence']
                 ))
+        
+        await asyncio.to_thread(self.write_changes, change_rows, content_rows)
+
+    def append_csv(self, change_rows: List[tuple]):
+        """Append saved changes to today's CSV export, starting a new file each day"""
+        today = datetime.now().date()
+        if today != self._csv_date:
+            if self._csv_file is not None:
+                self._csv_file.close()
+            csv_path = self.exports_dir / f"changes_data_{today}.csv"
+            is_new = not csv_path.exists() or csv_path.stat().st_size == 0
+            self._csv_file = open(csv_path, 'a', newline='', encoding='utf-8', buffering=1 << 16)
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_date = today
+            if is_new:
+                self._csv_writer.writerow(['timestamp', 'endpoint', 'change_type', 'significance_score', 'filename'])
+        
+        for timestamp, endpoint, change_type, score, _, _, filename in change_rows:
+            self._csv_writer.writerow([timestamp, endpoint, change_type, score, filename])
+        self._csv_file.flush()
+
+    def write_changes(self, change_rows: List[tuple], content_rows: List[tuple]):
+        """Insert change and discovered-content rows in a single transaction"""
+        with self.db:
+            self.db.executemany('''
+                INSERT INTO changes 
+                (timestamp, endpoint, change_type, significance_score, content_hash, extracted_data, filename)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', change_rows)
+            self.db.executemany('''
+                INSERT INTO discovered_content 
+                (timestamp, content_type, name, details, endpoint, confidence_score)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', content_rows)
+        # Only rows the database committed reach the CSV
+        self.append_csv(change_rows)
 
     async def generate_alert(self, change_data: Dict):
         """Generate high-priority alert for significant changes"""
-        alert_file = self.exports_dir / f"ALERT_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        # Endpoint in the name: concurrent checks can raise several alerts in the same second
+        safe_name = self._safe_name_re.sub('_', change_data['endpoint'])
+        alert_file = self.exports_dir / f"ALERT_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{safe_name}.md"
         
         analysis = change_data['analysis']
         
-        alert_content = f"""# 🚨 HIGH PRIORITY EA FC ALERT
+        parts = [f"""# 🚨 HIGH PRIORITY EA FC ALERT
         
 **Timestamp**: {change_data['timestamp']}
 **Endpoint**: {change_data['endpoint']}
@@ -381,30 +765,26 @@ class EAFCDataMiner:
 
 ## Detected Content
 
-"""
+"""]
         
         if analysis['found_sbcs']:
-            alert_content += f"### 🏆 SBCs Found ({len(analysis['found_sbcs'])})\n"
-            for sbc in analysis['found_sbcs'][:10]:
-                alert_content += f"- {sbc}\n"
-            alert_content += "\n"
+            parts.append(f"### 🏆 SBCs Found ({len(analysis['found_sbcs'])})\n")
+            parts.extend(f"- {sbc}\n" for sbc in analysis['found_sbcs'][:10])
+            parts.append("\n")
         
         if analysis['found_promos']:
-            alert_content += f"### 🎉 Promos Found ({len(analysis['found_promos'])})\n"
-            for promo in analysis['found_promos'][:10]:
-                alert_content += f"- {promo}\n"
-            alert_content += "\n"
+            parts.append(f"### 🎉 Promos Found ({len(analysis['found_promos'])})\n")
+            parts.extend(f"- {promo}\n" for promo in analysis['found_promos'][:10])
+            parts.append("\n")
         
         if analysis['found_packs']:
-            alert_content += f"### 📦 Packs Found ({len(analysis['found_packs'])})\n"
-            for pack in analysis['found_packs'][:10]:
-                alert_content += f"- {pack}\n"
-            alert_content += "\n"
+            parts.append(f"### 📦 Packs Found ({len(analysis['found_packs'])})\n")
+            parts.extend(f"- {pack}\n" for pack in analysis['found_packs'][:10])
+            parts.append("\n")
         
-        alert_content += f"\n**Raw File**: `{change_data['filename']}`\n"
+        parts.append(f"\n**Raw File**: `{change_data['filename']}`\n")
         
-        with open(alert_file, 'w', encoding='utf-8') as f:
-            f.write(alert_content)
+        await asyncio.to_thread(self.write_text, alert_file, ''.join(parts))
         
         logging.warning(f"🚨 HIGH PRIORITY ALERT GENERATED: {alert_file}")
 
@@ -413,66 +793,63 @@ class EAFCDataMiner:
         today = datetime.now().date()
         report_file = self.exports_dir / f"comprehensive_report_{today}.md"
         
-        with sqlite3.connect(self.db_path) as conn:
+        # Timestamps are local ISO strings, so everything from today sorts at or
+        # after the bare date and the timestamp index can serve a range seek
+        today_start = today.isoformat()
+        
+        with self.db as conn:
             # Get today's changes
             today_changes = conn.execute('''
-                SELECT * FROM changes 
-                WHERE date(timestamp) = date('now')
+                SELECT timestamp, endpoint, change_type, significance_score
+                FROM changes 
+                WHERE timestamp >= ?
                 ORDER BY significance_score DESC
-            ''').fetchall()
+            ''', (today_start,)).fetchall()
             
             # Get discovered content
             discovered_content = conn.execute('''
                 SELECT content_type, name, confidence_score, COUNT(*) as frequency
                 FROM discovered_content 
-                WHERE date(timestamp) = date('now')
+                WHERE timestamp >= ?
                 GROUP BY content_type, name
                 ORDER BY confidence_score DESC, frequency DESC
-            ''').fetchall()
+            ''', (today_start,)).fetchall()
+        
+        high_sig = [c for c in today_changes if c[3] > 10]
         
         # Generate comprehensive report
-        report = f"""# EA FC Comprehensive Daily Report - {today}
+        parts = [f"""# EA FC Comprehensive Daily Report - {today}
 
 ## Summary
 - **Total Changes**: {len(today_changes)}
-- **High Significance Changes**: {len([c for c in today_changes if c[4] > 10])}
+- **High Significance Changes**: {len(high_sig)}
 - **Unique Content Items**: {len(discovered_content)}
 
-"""
+"""]
         
         # High significance changes
-        high_sig = [c for c in today_changes if c[4] > 10]
         if high_sig:
-            report += f"## 🚨 High Significance Changes ({len(high_sig)})\n\n"
-            for change in high_sig:
-                report += f"### {change[2]} - Score: {change[4]}\n"
-                report += f"**Endpoint**: {change[1]}\n"
-                report += f"**Time**: {change[0]}\n"
-                report += f"**Type**: {change[3]}\n\n"
+            parts.append(f"## 🚨 High Significance Changes ({len(high_sig)})\n\n")
+            for timestamp, endpoint, change_type, score in high_sig:
+                parts.append(f"### {endpoint} - Score: {score}\n")
+                parts.append(f"**Endpoint**: {endpoint}\n")
+                parts.append(f"**Time**: {timestamp}\n")
+                parts.append(f"**Type**: {change_type}\n\n")
         
         # Discovered content summary
         if discovered_content:
-            report += "## 📋 Discovered Content\n\n"
+            parts.append("## 📋 Discovered Content\n\n")
             
             current_type = None
             for item in discovered_content:
                 content_type, name, confidence, frequency = item
                 if content_type != current_type:
-                    report += f"### {content_type}s\n"
+                    parts.append(f"### {content_type}s\n")
                     current_type = content_type
-                report += f"- **{name}** (Confidence: {confidence}%, Seen: {frequency}x)\n"
-            report += "\n"
-        
-        # Export CSV for analysis
-        csv_file = self.exports_dir / f"changes_data_{today}.csv"
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['timestamp', 'endpoint', 'change_type', 'significance_score', 'filename'])
-            for change in today_changes:
-                writer.writerow([change[0], change[1], change[3], change[4], change[7]])
+                parts.append(f"- **{name}** (Confidence: {confidence}%, Seen: {frequency}x)\n")
+            parts.append("\n")
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(report)
+        self.write_text(report_file, *parts)
         
         logging.info(f"📊 Comprehensive report exported: {report_file}")
 
@@ -482,28 +859,21 @@ class EAFCDataMiner:
         
         try:
             # Method 1: Analyze main web app
+            await self.bucket_for(self.endpoints["web_app_main"]).acquire()
             async with self.session.get(self.endpoints["web_app_main"]) as response:
                 if response.status == 200:
                     content = await response.text()
                     
                     # Find JavaScript files
-                    js_files = re.findall(r'src=["\']([^"\']*\.js[^"\']*)["\']', content)
+                    js_files = _JS_SRC_RE.findall(content)
                     for js_file in js_files[:10]:  # Limit to avoid spam
                         if not js_file.startswith('http'):
                             js_file = f"https://www.ea.com{js_file}"
                         discovered.add(js_file)
                     
                     # Find API patterns
-                    api_patterns = [
-                        r'"(https://[^"]*\.ea\.com[^"]*api[^"]*)"',
-                        r'"(/api/[^"]*)"',
-                        r'"(https://[^"]*fut[^"]*)"',
-                        r'"(https://[^"]*ultimate-team[^"]*)"'
-                    ]
-                    
-                    for pattern in api_patterns:
-                        matches = re.findall(pattern, content)
-                        for match in matches:
+                    for match in _DISCOVER_RE.findall(content):
+                        if is_api_candidate(match):
                             if not match.startswith('http'):
                                 match = f"https://www.ea.com{match}"
                             discovered.add(match)
@@ -524,31 +894,77 @@ class EAFCDataMiner:
         except Exception as e:
             logging.error(f"Error in endpoint discovery: {e}")
         
-        # Add discovered endpoints
+        # Add discovered endpoints. Names derive from the URL so they stay stable
+        # across runs and never collide with ones added by an earlier discovery.
         new_count = 0
         for url in discovered:
-            if url not in self.endpoints.values() and len(url) > 10:
-                endpoint_name = f"discovered_{new_count}"
+            key = canonical_url(url)
+            if key not in self._endpoint_urls and 10 < len(url) < 2048:
+                endpoint_name = f"discovered_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]}"
                 self.endpoints[endpoint_name] = url
+                self._endpoint_urls.add(key)
                 new_count += 1
                 logging.info(f"🔍 Added discovered endpoint: {url}")
         
+        self.evict_endpoints()
         logging.info(f"🔍 Discovery complete: {new_count} new endpoints added")
 
+    def evict_endpoints(self):
+        """Drop the least recently changed discovered endpoints beyond max_endpoints"""
+        while len(self.endpoints) > self.max_endpoints:
+            name = next((n for n in self.endpoints if n not in self._builtin_endpoints), None)
+            if name is None:
+                break
+            url = self.endpoints.pop(name)
+            self._endpoint_urls.discard(canonical_url(url))
+            if self.known_hashes.pop(name, None) is not None:
+                self._hashes_dirty = True
+            logging.info(f"🗑️ Evicted discovered endpoint: {url}")
+
+    def restore_hashes(self, changes: List[Dict]):
+        """Put back the pre-change hashes of unsaved changes so the next cycle detects them again"""
+        for change_data in changes:
+            name = change_data['endpoint']
+            previous = self._cycle_previous.get(name)
+            if previous is not None:
+                self.known_hashes[name] = previous
+                self._hashes_dirty = True
+
     async def run_monitoring_cycle(self):
         """Run one complete monitoring cycle"""
         cycle_start = time.time()
         logging.info(f"🔄 Starting monitoring cycle - {len(self.endpoints)} endpoints")
         
         changes_detected = []
+        self._cycle_previous = {}
         
-        for name, url in self.endpoints.items():
+        # Check endpoints concurrently; the semaphore bounds requests in flight and
+        # the connector's per-host limit keeps any single EA host from being hammered
+        semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+        
+        async def guarded_check(name, url):
+            async with semaphore:
+                return await self.check_endpoint(name, url)
+        
+        endpoints = list(self.endpoints.items())
+        results = await asyncio.gather(
+            *(guarded_check(name, url) for name, url in endpoints),
+            return_exceptions=True
+        )
+        
+        for (name, url), result in zip(endpoints, results):
+            if isinstance(result, Exception):
+                logging.error(f"💥 Error in cycle for {name}: {result}")
+            elif result:
+                changes_detected.append(result)
+        
+        # One transaction (and one commit) for everything detected this cycle
+        if changes_detected:
             try:
-                change_data = await self.check_endpoint(name, url)
-                if change_data:
-                    changes_detected.append(change_data)
+                await self.save_to_database(changes_detected)
             except Exception as e:
-                logging.error(f"💥 Error in cycle for {name}: {e}")
+                logging.error(f"Error saving {len(changes_detected)} changes, retrying next cycle: {e}")
+                self.restore_hashes(changes_detected)
         
         cycle_duration = time.time() - cycle_start
         
@@ -562,7 +978,8 @@ class EAFCDataMiner:
         else:
             logging.info(f"✅ No changes detected ({cycle_duration:.1f}s scan)")
         
-        self.save_known_hashes()
+        if self._hashes_dirty:
+            self.save_known_hashes()
         return changes_detected
 
     async def start_monitoring(self):
@@ -589,7 +1006,7 @@ class EAFCDataMiner:
                 
                 # Export reports
                 if changes or cycle_count % 6 == 0:  # Every 6 cycles or when changes found
-                    self.export_comprehensive_report()
+                    await asyncio.to_thread(self.export_comprehensive_report)
                 
                 # Calculate next check time
                 cycle_duration = time.time() - cycle_start
@@ -607,6 +1024,7 @@ class EAFCDataMiner:
         finally:
             if self.session:
                 await self.session.close()
+            self.close()
             logging.info("🏁 EA FC DataMiner stopped")
 
 # Main execution
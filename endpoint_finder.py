@@ -4,12 +4,40 @@ EA FC Endpoint Finder - Run this locally to find real EA FC URLs
 Then update your Railway deployment with the working endpoints
 """
 
-import requests
+import asyncio
+import aiohttp
 import re
 import json
 from urllib.parse import urljoin, urlparse
 
-def find_ea_fc_endpoints():
+# Script tags in the web app page
+JS_SRC_RE = re.compile(r'src=["\']([^"\']+\.js[^"\']*)["\']')
+
+# API references inside the JavaScript bundles
+API_PATTERNS = [
+    re.compile(r'"(/api/[^"]+)"'),
+    re.compile(r"'(/api/[^']+)'"),
+    re.compile(r'"(https://[^"]*api[^"]*)"'),
+    re.compile(r"'(https://[^']*api[^']*)'"),
+    re.compile(r'"(/fut[^"]*)"'),
+    re.compile(r'"(https://[^"]*fut[^"]*)"'),
+]
+
+MAX_CONCURRENT_REQUESTS = 8  # Requests in flight at once against EA's hosts
+
+async def fetch_text(session, semaphore, url, timeout=10):
+    """GET a URL and return (status, text)"""
+    async with semaphore:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            return response.status, await response.text()
+
+async def head_status(session, semaphore, url, timeout=5):
+    """HEAD a URL and return its status code"""
+    async with semaphore:
+        async with session.head(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            return response.status
+
+async def find_ea_fc_endpoints():
     """Find real EA FC endpoints by analyzing the web app"""
     
     print("🔍 Analyzing EA FC Web App for API endpoints...")
@@ -22,70 +50,71 @@ def find_ea_fc_endpoints():
     
     discovered_endpoints = {}
     
-    try:
-        # Get main page
-        response = requests.get(base_url, headers=headers, timeout=10)
-        if response.status_code != 200:
-            print(f"❌ Could not access EA FC web app: {response.status_code}")
-            return {}
-        
-        content = response.text
-        print("✅ Successfully loaded EA FC web app")
-        
-        # Find JavaScript files
-        js_pattern = r'src=["\']([^"\']+\.js[^"\']*)["\']'
-        js_files = re.findall(js_pattern, content)
-        
-        print(f"📄 Found {len(js_files)} JavaScript files")
-        
-        # Analyze JavaScript files for API endpoints
-        api_endpoints = set()
-        
-        for js_file in js_files[:5]:  # Check first 5 JS files
-            if not js_file.startswith('http'):
-                js_url = urljoin(base_url, js_file)
-            else:
-                js_url = js_file
-            
-            try:
+    # One session for every request so connections (and TLS) are reused, and
+    # independent requests run concurrently instead of one after another
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with aiohttp.ClientSession(headers=headers) as session:
+        try:
+            # Get main page
+            status, content = await fetch_text(session, semaphore, base_url)
+            if status != 200:
+                print(f"❌ Could not access EA FC web app: {status}")
+                return {}
+            
+            print("✅ Successfully loaded EA FC web app")
+            
+            # Find JavaScript files
+            js_files = JS_SRC_RE.findall(content)
+            
+            print(f"📄 Found {len(js_files)} JavaScript files")
+            
+            # Analyze JavaScript files for API endpoints
+            api_endpoints = set()
+            
+            js_urls = []
+            for js_file in js_files[:5]:  # Check first 5 JS files
+                if not js_file.startswith('http'):
+                    js_urls.append(urljoin(base_url, js_file))
+                else:
+                    js_urls.append(js_file)
+            
+            for js_url in js_urls:
                 print(f"📁 Analyzing: {js_url}")
-                js_response = requests.get(js_url, headers=headers, timeout=10)
-                if js_response.status_code == 200:
-                    js_content = js_response.text
-                    
+            js_results = await asyncio.gather(
+                *(fetch_text(session, semaphore, js_url) for js_url in js_urls),
+                return_exceptions=True
+            )
+            
+            for js_url, result in zip(js_urls, js_results):
+                if isinstance(result, Exception):
+                    print(f"⚠️ Error analyzing {js_url}: {result}")
+                    continue
+                
+                js_status, js_content = result
+                if js_status == 200:
                     # Find API patterns in JavaScript
-                    api_patterns = [
-                        r'"(/api/[^"]+)"',
-                        r"'(/api/[^']+)'",
-                        r'"(https://[^"]*api[^"]*)"',
-                        r"'(https://[^']*api[^']*)'",
-                        r'"(/fut[^"]*)"',
-                        r'"(https://[^"]*fut[^"]*)"'
-                    ]
-                    
-                    for pattern in api_patterns:
-                        matches = re.findall(pattern, js_content)
-                        for match in matches:
+                    for pattern in API_PATTERNS:
+                        for match in pattern.findall(js_content):
                             if match.startswith('/'):
                                 api_endpoints.add(urljoin(base_url, match))
                             else:
                                 api_endpoints.add(match)
             
-            except Exception as e:
-                print(f"⚠️ Error analyzing {js_url}: {e}")
-        
-        # Test discovered endpoints
-        print(f"\n🧪 Testing {len(api_endpoints)} discovered endpoints...")
-        
-        working_endpoints = {}
-        
-        for i, endpoint in enumerate(api_endpoints):
-            if i >= 20:  # Limit testing to avoid spam
-                break
-                
-            try:
-                test_response = requests.head(endpoint, headers=headers, timeout=5)
-                status = test_response.status_code
+            # Test discovered endpoints
+            print(f"\n🧪 Testing {len(api_endpoints)} discovered endpoints...")
+            
+            working_endpoints = {}
+            
+            candidates = list(api_endpoints)[:20]  # Limit testing to avoid spam
+            probe_results = await asyncio.gather(
+                *(head_status(session, semaphore, endpoint) for endpoint in candidates),
+                return_exceptions=True
+            )
+            
+            for i, (endpoint, status) in enumerate(zip(candidates, probe_results)):
+                if isinstance(status, Exception):
+                    print(f"❌ {endpoint}: Error - {status}")
+                    continue
                 
                 endpoint_name = f"api_{i}"
                 if 'sbc' in endpoint.lower():
@@ -102,26 +131,28 @@ def find_ea_fc_endpoints():
                     print(f"✅ {endpoint_name}: {endpoint} (HTTP {status})")
                 else:
                     print(f"❌ {endpoint}: HTTP {status}")
-                    
-            except Exception as e:
-                print(f"❌ {endpoint}: Error - {e}")
-        
-        # Add some known working patterns to test
-        test_patterns = [
-            "https://www.ea.com/fifa/ultimate-team/web-app/config/config.json",
-            "https://www.ea.com/fifa/ultimate-team/web-app/loc/messages_en.json",
-            "https://www.ea.com/fifa/ultimate-team/web-app/content/",
-            "https://www.easports.com/fifa/ultimate-team/web-app/",
-            "https://fifa25.content.easports.com/fifa/fltOnlineAssets/",  # Try current version
-            "https://media.contentapi.ea.com/content/dam/eacom/fifa/",
-        ]
-        
-        print(f"\n🎯 Testing known EA FC patterns...")
-        
-        for pattern in test_patterns:
-            try:
-                test_response = requests.head(pattern, headers=headers, timeout=5)
-                if test_response.status_code in [200, 403, 405]:
+            
+            # Add some known working patterns to test
+            test_patterns = [
+                "https://www.ea.com/fifa/ultimate-team/web-app/config/config.json",
+                "https://www.ea.com/fifa/ultimate-team/web-app/loc/messages_en.json",
+                "https://www.ea.com/fifa/ultimate-team/web-app/content/",
+                "https://www.easports.com/fifa/ultimate-team/web-app/",
+                "https://fifa25.content.easports.com/fifa/fltOnlineAssets/",  # Try current version
+                "https://media.contentapi.ea.com/content/dam/eacom/fifa/",
+            ]
+            
+            print(f"\n🎯 Testing known EA FC patterns...")
+            
+            pattern_results = await asyncio.gather(
+                *(head_status(session, semaphore, pattern) for pattern in test_patterns),
+                return_exceptions=True
+            )
+            
+            for pattern, status in zip(test_patterns, pattern_results):
+                if isinstance(status, Exception):
+                    continue
+                if status in [200, 403, 405]:
                     name = f"known_{len(working_endpoints)}"
                     if 'config' in pattern:
                         name = 'config_file'
@@ -131,14 +162,12 @@ def find_ea_fc_endpoints():
                         name = 'content_cdn'
                     
                     working_endpoints[name] = pattern
-                    print(f"✅ {name}: {pattern} (HTTP {test_response.status_code})")
-            except:
-                pass
-        
-        discovered_endpoints = working_endpoints
-        
-    except Exception as e:
-        print(f"❌ Error analyzing EA FC web app: {e}")
+                    print(f"✅ {name}: {pattern} (HTTP {status})")
+            
+            discovered_endpoints = working_endpoints
+            
+        except Exception as e:
+            print(f"❌ Error analyzing EA FC web app: {e}")
     
     return discovered_endpoints
 
@@ -181,7 +210,7 @@ def main():
 ╚══════════════════════════════════════════════════════════════╝
     """)
     
-    endpoints = find_ea_fc_endpoints()
+    endpoints = asyncio.run(find_ea_fc_endpoints())
     generate_railway_config(endpoints)
     
     if endpoints:
@@ -10,6 +10,16 @@ import re
 from pathlib import Path
 import time
 
+# Script tags in the web app page
+JS_SRC_RE = re.compile(r'src=["\']([^"\']*\.js[^"\']*)["\']')
+
+# API references in the web app page
+API_PATTERNS = [
+    re.compile(r'"(https://[^"]*\.ea\.com[^"]*api[^"]*)"'),
+    re.compile(r'"(/api/[^"]*)"'),
+    re.compile(r'"(https://[^"]*fut[^"]*)"'),
+]
+
 def test_endpoint(url, timeout=10):
     """Test if an endpoint is accessible and return info"""
     headers = {
@@ -56,8 +66,7 @@ def discover_from_main_page():
             content = requests.get("https://www.ea.com/fifa/ultimate-team/web-app/").text
             
             # Find JavaScript files
-            js_pattern = r'src=["\']([^"\']*\.js[^"\']*)["\']'
-            js_files = re.findall(js_pattern, content)
+            js_files = JS_SRC_RE.findall(content)
             
             for js_file in js_files:
                 if not js_file.startswith('http'):
@@ -65,14 +74,8 @@ def discover_from_main_page():
                 discovered_urls.add(js_file)
             
             # Find API references
-            api_patterns = [
-                r'"(https://[^"]*\.ea\.com[^"]*api[^"]*)"',
-                r'"(/api/[^"]*)"',
-                r'"(https://[^"]*fut[^"]*)"',
-            ]
-            
-            for pattern in api_patterns:
-                matches = re.findall(pattern, content)
+            for pattern in API_PATTERNS:
+                matches = pattern.findall(content)
                 for match in matches:
                     if not match.startswith('http'):
                         match = f"https://www.ea.com{match}"
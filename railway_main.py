@@ -8,20 +8,50 @@ import os
 import asyncio
 import aiohttp
 import json
+import copy
 import hashlib
 import logging
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
 import re
-from typing import Dict, List, Optional, Union
+from typing import Deque, Dict, List, Optional, Union
+from collections import OrderedDict, deque
+from itertools import islice
 import signal
 import sys
+import time
+import random
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from aiohttp import web
+from html import escape
 from dotenv import load_dotenv
 from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from datetime import datetime, timedelta, timezone
 
+# aiohttp only decompresses 'br' responses when a Brotli decoder is installed
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Optional faster JSON encoder/decoder for the database columns and API responses
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional libuv-based event loop; asyncio's default loop is used without it
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
 # Load environment variables
 load_dotenv()
 
@@ -70,6 +100,141 @@ def redact_url(u: str) -> str:
     except Exception:
         return u
 
+# Bodies at least this long are analysed in a worker process instead of on the event loop
+ANALYSIS_OFFLOAD_CHARS = 256_000
+
+# Only this much of a body is kept for analysis; the hash still covers all of it
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak If-None-Match comparison: any listed tag (or '*') matches, ignoring W/ prefixes"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    bare = etag[2:] if etag.startswith('W/') else etag
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == bare:
+            return True
+    return False
+
+def dump_json(data) -> str:
+    """Serialize to a JSON string, with orjson when it is installed"""
+    if HAS_ORJSON:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data)
+
+def load_json(text):
+    """Parse a JSON string, with orjson when it is installed"""
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# Per pattern category: analysis field, score per match, change type and confidence
+CATEGORY_RULES = {
+    'sbc_indicators': ('found_sbcs', 5, 'sbc_update', 85),
+    'evolution_indicators': ('found_evolutions', 8, 'evolution_update', 88),
+    'promo_indicators': ('found_promos', 8, 'promo_update', 90),
+    'competitive_indicators': ('found_competitive', 6, 'competitive_update', 82),
+    'player_indicators': ('found_players', 3, 'player_update', 65),
+    'pack_indicators': ('found_packs', 4, 'pack_update', 75),
+    'objective_indicators': ('found_objectives', 4, 'objective_update', 80),
+    'feature_indicators': ('found_features', 6, 'feature_update', 85),
+    'market_indicators': ('found_market', 3, 'market_update', 70),
+    'social_indicators': ('found_social', 2, 'social_update', 60),
+}
+
+# Terms that each add to the significance score when present in a body
+HIGH_VALUE_TERMS = (
+    'toty', 'tots', 'icon', 'hero', 'flashback', 'fut champions',
+    'lightning round', 'beta', 'new feature', 'evolution', 'academy',
+    'weekend league', 'division rivals', 'squad battles', 'rewards',
+    'promo', 'special card', 'limited time', 'pack odds'
+)
+
+# Hints that a body is a JavaScript bundle or config file
+CONFIG_INDICATORS = ('api/', 'endpoint', 'url:', 'config', 'auth')
+
+# Endpoint-specific boosts (by content hints)
+ENDPOINT_INDICATORS = {
+    'academy': 12,   # Evolutions/Academy
+    'champs': 10,    # FUT Champs
+    'sbs': 10,       # SBCs
+    'rivals': 8,     # Division Rivals
+    'featured': 8,   # Featured squads/TOTW
+    'store': 7,      # Store
+    'tradepile': 5,  # Market activity
+    'squad': 4,      # Squad management
+    'social': 3,     # Social
+    'appstats': 5,
+    'attributes/metadata': 6,
+    'setid': 6
+}
+
+def analyze_text(content: str, compiled_patterns: Dict[str, list]) -> Dict:
+    """Analyze content for EA FC patterns; a plain function so it can run in a worker process"""
+    analysis = {
+        'found_sbcs': [],
+        'found_evolutions': [],
+        'found_promos': [],
+        'found_players': [],
+        'found_packs': [],
+        'found_objectives': [],
+        'found_features': [],
+        'found_competitive': [],
+        'found_market': [],
+        'found_social': [],
+        'significance_score': 0,
+        'change_type': 'unknown',
+        'confidence': 50
+    }
+    
+    # Enhanced pattern matching with categories
+    for category, patterns in compiled_patterns.items():
+        matches = []
+        for pattern in patterns:
+            matches.extend(pattern.findall(content))
+        
+        if category in CATEGORY_RULES:
+            field, weight, change_type, confidence = CATEGORY_RULES[category]
+            analysis[field] = list(set(matches))[:10]
+            analysis['significance_score'] += len(matches) * weight
+            if matches:
+                analysis['change_type'] = change_type
+                analysis['confidence'] = confidence
+    
+    # High-value terms boost
+    content_lower = content.lower()
+    value_boost = 0
+    for term in HIGH_VALUE_TERMS:
+        if term in content_lower:
+            value_boost += 8
+            analysis['confidence'] = min(95, analysis['confidence'] + 8)
+    
+    analysis['significance_score'] += value_boost
+    
+    # JavaScript/config file specific boosts
+    if any(indicator in content_lower for indicator in CONFIG_INDICATORS):
+        analysis['significance_score'] += 4
+        if analysis['change_type'] == 'unknown':
+            analysis['change_type'] = 'config_update'
+
+    # Endpoint-specific boosts (by content hints)
+    for indicator, boost in ENDPOINT_INDICATORS.items():
+        if indicator in content_lower:
+            analysis['significance_score'] += boost
+            analysis['confidence'] = min(95, analysis['confidence'] + 5)
+
+    # Final: ensure a concrete change_type and clamp confidence
+    if analysis['change_type'] == 'unknown':
+        analysis['change_type'] = 'config_update'
+    analysis['confidence'] = min(100, analysis['confidence'])
+
+    return analysis
+
 class RailwayEAFCDataMiner:
     def __init__(self):
         # Railway environment variables
@@ -91,9 +256,20 @@ class RailwayEAFCDataMiner:
 
         # Data storage
         self.known_hashes: Dict[str, str] = {}   # endpoint_name -> last_content_hash
-        self.changes_log: List[Dict] = []
+        self.last_status: Dict[str, int] = {}    # endpoint_name -> last recorded status code
+        self._pending_hashes: Dict[str, str] = {}  # Hash updates not yet written to the DB
+        self._validators: Dict[str, Dict[str, str]] = {}  # endpoint_name -> conditional GET headers
+        self.changes_log: Deque[Dict] = deque(maxlen=100)  # Only the last 100 changes are kept
         self.session = None
         self.running = False
+        self._analysis_pool = None  # Created on the first large body
+        self._stats_cache = None  # (expires_at, etag, body) for /stats
+        self.stats_ttl = 30  # Seconds a /stats response is reused
+        self._analysis_cache: OrderedDict = OrderedDict()  # content_hash -> analysis, most recent last
+        self.analysis_cache_size = 64
+        self.max_concurrent_checks = int(os.getenv('MAX_CONCURRENT_CHECKS', 4))
+        self.rate_limit_backoff = 30  # Seconds a host is left alone after a 429
+        self._host_backoff: Dict[str, float] = {}  # host -> monotonic time its backoff ends
         
         # Create minimal directory structure
         Path("data").mkdir(exist_ok=True)
@@ -392,12 +568,25 @@ class RailwayEAFCDataMiner:
             ]
         }
         
+        # Compile every pattern once; the analysis path reuses them per change
+        self._compiled_patterns = {
+            category: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for category, patterns in self.content_patterns.items()
+        }
+        
         logging.info("🚂 Railway EA FC DataMiner initialized")
 
     # ---------- Database ----------
+    def connect_db(self) -> sqlite3.Connection:
+        """Open a connection that waits up to 30s for another writer instead of failing as locked"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
     def init_database(self):
         """Initialize SQLite database"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect_db() as conn:
+            # WAL lets the web handlers read while the worker threads write; the mode
+            # is stored in the database file, so every later connection uses it
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS changes (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -447,26 +636,34 @@ class RailwayEAFCDataMiner:
     def load_known_hashes_from_db(self):
         """Load persisted content hashes into memory at startup."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connect_db() as conn:
                 rows = conn.execute("SELECT endpoint, content_hash FROM known_hashes").fetchall()
                 self.known_hashes = {endpoint: h for endpoint, h in rows}
                 logging.info(f"🧠 Loaded {len(self.known_hashes)} known hashes from DB")
         except Exception as e:
             logging.error(f"Failed to load known_hashes: {e}")
 
-    def upsert_known_hash(self, endpoint: str, content_hash: str):
-        """Persist/Update content hash for an endpoint."""
+    def upsert_known_hashes(self, hashes: Dict[str, str]):
+        """Persist/Update content hashes for a batch of endpoints in one transaction."""
+        updated_at = datetime.now(timezone.utc).isoformat()
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute('''
+            with self.connect_db() as conn:
+                conn.executemany('''
                     INSERT INTO known_hashes (endpoint, content_hash, updated_at)
                     VALUES (?, ?, ?)
                     ON CONFLICT(endpoint) DO UPDATE SET
                         content_hash=excluded.content_hash,
                         updated_at=excluded.updated_at
-                ''', (endpoint, content_hash, datetime.now(timezone.utc).isoformat()))
+                ''', [(endpoint, h, updated_at) for endpoint, h in hashes.items()])
         except Exception as e:
-            logging.error(f"Failed to persist known_hash for {endpoint}: {e}")
+            logging.error(f"Failed to persist {len(hashes)} known hashes: {e}")
+
+    async def flush_known_hashes(self):
+        """Write the hash updates collected during a cycle"""
+        if not self._pending_hashes:
+            return
+        pending, self._pending_hashes = self._pending_hashes, {}
+        await asyncio.to_thread(self.upsert_known_hashes, pending)
 
     # ---------- HTTP ----------
     async def initialize_session(self):
@@ -475,7 +672,7 @@ class RailwayEAFCDataMiner:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit(KHTML, like Gecko) Chrome/120 Safari/537.36',
             'Accept': 'application/json, text/html, application/xhtml+xml, application/xml;q=0.9, image/webp, */*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate',
             'Connection': 'keep-alive',
             'DNT': '1',
             'Cache-Control': 'no-cache',
@@ -483,7 +680,14 @@ class RailwayEAFCDataMiner:
         }
         
         timeout = aiohttp.ClientTimeout(total=30)
-        connector = aiohttp.TCPConnector(limit=3, ttl_dns_cache=300)
+        # Endpoints sit on a handful of hosts, so cap per host and keep idle
+        # connections (and their TLS sessions) around between nearby checks
+        connector = aiohttp.TCPConnector(
+            limit=32,
+            limit_per_host=4,
+            keepalive_timeout=120,
+            ttl_dns_cache=600
+        )
         
         self.session = aiohttp.ClientSession(
             headers=headers,
@@ -491,14 +695,17 @@ class RailwayEAFCDataMiner:
             connector=connector
         )
 
-    def get_file_hash(self, content: str) -> str:
-        """Generate SHA256 hash of content"""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    def decode_body(self, body: bytes, charset: Optional[str]) -> str:
+        """Decode a response body, falling back to UTF-8 for missing or unknown charsets"""
+        try:
+            return body.decode(charset or 'utf-8', 'replace')
+        except LookupError:
+            return body.decode('utf-8', 'replace')
 
     async def check_endpoint(self, name: str, url_or_cfg: Union[str, dict]) -> Optional[Dict]:
         """Check endpoint for changes (supports per-endpoint overrides)"""
         try:
-            await asyncio.sleep(2)  # Rate limiting
+            await asyncio.sleep(2 + random.random() * 0.25)  # Rate limiting, jittered so parallel checks drift apart
 
             # allow dict config: {"url":..., "method":..., "headers":..., "json":..., "expect":[...]}
             if isinstance(url_or_cfg, dict):
@@ -518,6 +725,11 @@ class RailwayEAFCDataMiner:
             merged_headers = dict(extra_headers) if extra_headers else {}
             merged_headers.update(self.AUTH_HEADERS)
 
+            # Revalidate with the last 200's ETag/Last-Modified so unchanged bodies aren't resent
+            validators = self._validators.get(name)
+            if method == "GET" and validators:
+                merged_headers.update(validators)
+
             req_kwargs = {"headers": merged_headers}
             if json_body is not None:
                 req_kwargs["json"] = json_body
@@ -525,38 +737,54 @@ class RailwayEAFCDataMiner:
             async with self.session.request(method, url, **req_kwargs) as response:
                 status_code = response.status
                 
-                # Track status code changes
-                await self.track_status_change(name, status_code)
+                # Track status code changes; a 304 means the endpoint is up and unchanged
+                await self.track_status_change(name, 200 if status_code == 304 else status_code)
                 
+                if status_code == 304:
+                    return None
+
                 # treat “expected” non-200 as info, not warnings
                 if expect and status_code in expect and status_code != 200:
                     logging.info(f"ℹ️ HTTP {status_code} (expected) for {name}")
                     return None
 
                 if status_code == 200:
-                    content = await response.text()
-                    current_hash = self.get_file_hash(content)
+                    # Hash the raw body as it streams in; unchanged responses are never
+                    # decoded or analysed, and oversized ones are only partly buffered
+                    digest = hashlib.sha256()
+                    body = bytearray()
+                    async for chunk in response.content.iter_chunked(65536):
+                        digest.update(chunk)
+                        if len(body) < MAX_BODY_BYTES:
+                            body.extend(chunk[:MAX_BODY_BYTES - len(body)])
+                    current_hash = digest.hexdigest()
+                    
+                    change_data = None
                     
                     # First time tracking this endpoint
                     if name not in self.known_hashes:
                         self.known_hashes[name] = current_hash
-                        self.upsert_known_hash(name, current_hash)
+                        self._pending_hashes[name] = current_hash
                         logging.info(f"✅ New endpoint tracked: {name}")
-                        return None
                     
                     # Check for changes
-                    if self.known_hashes[name] != current_hash:
+                    elif self.known_hashes[name] != current_hash:
                         logging.warning(f"🚨 CHANGE DETECTED: {name}")
-                        change_data = await self.process_change(name, url, content, status_code)
+                        content = self.decode_body(body, response.charset)
+                        change_data = await self.process_change(name, url, content, status_code, current_hash)
                         self.known_hashes[name] = current_hash
-                        self.upsert_known_hash(name, current_hash)
-                        return change_data
+                        self._pending_hashes[name] = current_hash
+                    
+                    # Only remember validators once the body has been fully handled
+                    self.remember_validators(name, response.headers)
+                    return change_data
                         
                 elif status_code == 401:
                     logging.debug(f"🔒 Auth required: {name}")
                 elif status_code == 429:
                     logging.warning(f"⏰ Rate limited: {name}")
-                    await asyncio.sleep(30)
+                    # Later checks against this host wait outside the concurrency slots
+                    self._host_backoff[urlsplit(url).netloc] = time.monotonic() + self.rate_limit_backoff
                 else:
                     logging.warning(f"⚠️ HTTP {status_code} for {name}")
                     
@@ -565,35 +793,66 @@ class RailwayEAFCDataMiner:
         
         return None
 
+    def remember_validators(self, name: str, headers):
+        """Keep the response's cache validators for the next conditional GET"""
+        validators = {}
+        if headers.get('ETag'):
+            validators['If-None-Match'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = headers['Last-Modified']
+        if validators:
+            self._validators[name] = validators
+        else:
+            self._validators.pop(name, None)
+
     async def track_status_change(self, endpoint: str, status_code: int):
         """Track status code changes for endpoints"""
+        # Unchanged statuses are answered from memory without touching SQLite
+        if self.last_status.get(endpoint) == status_code:
+            return
+        # The SQLite work runs in a worker thread so other checks keep going; the
+        # in-memory status is only read and updated here, on the event loop
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Get last known status
-                last_status = conn.execute(
-                    "SELECT status_code FROM endpoint_status WHERE endpoint = ? ORDER BY created_at DESC LIMIT 1",
-                    (endpoint,)
-                ).fetchone()
-                
-                current_time = datetime.now().isoformat()
-                
-                if last_status is None:
-                    conn.execute(
-                        "INSERT INTO endpoint_status (endpoint, status_code, last_checked) VALUES (?, ?, ?)",
-                        (endpoint, status_code, current_time)
-                    )
-                elif last_status[0] != status_code:
-                    conn.execute(
-                        "INSERT INTO endpoint_status (endpoint, status_code, last_checked, status_changed) VALUES (?, ?, ?, ?)",
-                        (endpoint, status_code, current_time, current_time)
-                    )
-                    if (last_status[0] == 401 and status_code == 200) or (last_status[0] == 404 and status_code == 200):
-                        logging.warning(f"🎉 STATUS CHANGE: {endpoint} changed from {last_status[0]} to {status_code}")
-                        if status_code == 200:
-                            await self.send_status_change_notification(endpoint, last_status[0], status_code)
-                
+            last_status = await asyncio.to_thread(
+                self.record_status, endpoint, status_code,
+                endpoint in self.last_status, self.last_status.get(endpoint)
+            )
         except Exception as e:
             logging.error(f"Error tracking status for {endpoint}: {e}")
+            return
+        self.last_status[endpoint] = status_code
+        if last_status is not None and last_status != status_code:
+            if (last_status == 401 and status_code == 200) or (last_status == 404 and status_code == 200):
+                logging.warning(f"🎉 STATUS CHANGE: {endpoint} changed from {last_status} to {status_code}")
+                if status_code == 200:
+                    await self.send_status_change_notification(endpoint, last_status, status_code)
+
+    def record_status(self, endpoint: str, status_code: int, known: bool, previous: Optional[int]) -> Optional[int]:
+        """Record a status code if it differs from the last one; returns the previous status"""
+        with self.connect_db() as conn:
+            # Get last known status; the DB is only read on the first check after a restart
+            if known:
+                last_status = previous
+            else:
+                row = conn.execute(
+                    "SELECT status_code FROM endpoint_status WHERE endpoint = ? ORDER BY id DESC LIMIT 1",
+                    (endpoint,)
+                ).fetchone()
+                last_status = row[0] if row else None
+            
+            current_time = datetime.now().isoformat()
+            
+            if last_status is None:
+                conn.execute(
+                    "INSERT INTO endpoint_status (endpoint, status_code, last_checked) VALUES (?, ?, ?)",
+                    (endpoint, status_code, current_time)
+                )
+            elif last_status != status_code:
+                conn.execute(
+                    "INSERT INTO endpoint_status (endpoint, status_code, last_checked, status_changed) VALUES (?, ?, ?, ?)",
+                    (endpoint, status_code, current_time, current_time)
+                )
+            return last_status
 
     async def send_status_change_notification(self, endpoint: str, old_status: int, new_status: int):
         """Send notification for significant status changes"""
@@ -622,12 +881,20 @@ class RailwayEAFCDataMiner:
             logging.error(f"Status notification error: {e}")
 
     # ---------- Changes / Analysis ----------
-    async def process_change(self, name: str, url: str, content: str, status_code: int) -> Dict:
+    async def process_change(self, name: str, url: str, content: str, status_code: int, content_hash: str) -> Dict:
         """Process detected change"""
         timestamp = datetime.now()
         
-        # Analyze content
-        analysis = await self.analyze_content(content)
+        # Analyze content; endpoints that flip back to an earlier body reuse its analysis
+        cached = self._analysis_cache.get(content_hash)
+        if cached is not None:
+            self._analysis_cache.move_to_end(content_hash)
+            analysis = copy.deepcopy(cached)
+        else:
+            analysis = await self.analyze_content(content)
+            self._analysis_cache[content_hash] = copy.deepcopy(analysis)
+            if len(self._analysis_cache) > self.analysis_cache_size:
+                self._analysis_cache.popitem(last=False)
         
         change_data = {
             'timestamp': timestamp.isoformat(),
@@ -635,6 +902,7 @@ class RailwayEAFCDataMiner:
             'url': redact_url(url),
             'analysis': analysis,
             'content_length': len(content),
+            'content_hash': content_hash,
             'status_code': status_code
         }
         
@@ -648,21 +916,24 @@ class RailwayEAFCDataMiner:
         if analysis['significance_score'] > self.low_threshold:
             await self.send_discord_notification(change_data)
         
-        # Keep in-memory log
+        # Keep in-memory log; the deque drops the oldest entry itself
         self.changes_log.append(change_data)
-        if len(self.changes_log) > 100:  # Keep only last 100 changes
-            self.changes_log.pop(0)
+        self._stats_cache = None
         
         return change_data
 
     async def save_discovered_content(self, change_data: Dict):
         """Save individual discovered content items"""
+        await asyncio.to_thread(self.write_discovered_content, change_data)
+
+    def write_discovered_content(self, change_data: Dict):
+        """Insert the discovered content items of one change; runs in a worker thread"""
         analysis = change_data['analysis']
         timestamp = change_data['timestamp']
         endpoint = change_data['endpoint']
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connect_db() as conn:
                 for sbc in analysis.get('found_sbcs', []):
                     conn.execute(
                         "INSERT INTO discovered_content (timestamp, content_type, name, confidence_score, endpoint) VALUES (?, ?, ?, ?, ?)",
@@ -693,153 +964,35 @@ class RailwayEAFCDataMiner:
 
     async def analyze_content(self, content: str) -> Dict:
         """Analyze content for EA FC patterns with enhanced detection"""
-        analysis = {
-            'found_sbcs': [],
-            'found_evolutions': [],
-            'found_promos': [],
-            'found_players': [],
-            'found_packs': [],
-            'found_objectives': [],
-            'found_features': [],
-            'found_competitive': [],
-            'found_market': [],
-            'found_social': [],
-            'significance_score': 0,
-            'change_type': 'unknown',
-            'confidence': 50
-        }
-        
-        # Enhanced pattern matching with categories
-        for category, patterns in self.content_patterns.items():
-            matches = []
-            for pattern in patterns:
-                found = re.findall(pattern, content, re.IGNORECASE)
-                matches.extend(found)
-            
-            if category == 'sbc_indicators':
-                analysis['found_sbcs'] = list(set(matches))[:10]
-                analysis['significance_score'] += len(matches) * 5
-                if matches:
-                    analysis['change_type'] = 'sbc_update'
-                    analysis['confidence'] = 85
-                    
-            elif category == 'evolution_indicators':
-                analysis['found_evolutions'] = list(set(matches))[:10]
-                analysis['significance_score'] += len(matches) * 8
-                if matches:
-                    analysis['change_type'] = 'evolution_update'
-                    analysis['confidence'] = 88
-                    
-            elif category == 'promo_indicators':
-                analysis['found_promos'] = list(set(matches))[:10]
-                analysis['significance_score'] += len(matches) * 8
-                if matches:
-                    analysis['change_type'] = 'promo_update'
-                    analysis['confidence'] = 90
-                    
-            elif category == 'competitive_indicators':
-                analysis['found_competitive'] = list(set(matches))[:10]
-                analysis['significance_score'] += len(matches) * 6
-                if matches:
-                    analysis['change_type'] = 'competitive_update'
-                    analysis['confidence'] = 82
-                    
-            elif category == 'player_indicators':
-                analysis['found_players'] = list(set(matches))[:10]
-                analysis['significance_score'] += len(matches) * 3
-                if matches:
-                    analysis['change_type'] = 'player_update'
-                    analysis['confidence'] = 65
-                    
-            elif category == 'pack_indicators':
-                analysis['found_packs'] = list(set(matches))[:10]
-                analysis['significance_score'] += len(matches) * 4
-                if matches:
-                    analysis['change_type'] = 'pack_update'
-                    analysis['confidence'] = 75
-                    
-            elif category == 'objective_indicators':
-                analysis['found_objectives'] = list(set(matches))[:10]
-                analysis['significance_score'] += len(matches) * 4
-                if matches:
-                    analysis['change_type'] = 'objective_update'
-                    analysis['confidence'] = 80
-                    
-            elif category == 'feature_indicators':
-                analysis['found_features'] = list(set(matches))[:10]
-                analysis['significance_score'] += len(matches) * 6
-                if matches:
-                    analysis['change_type'] = 'feature_update'
-                    analysis['confidence'] = 85
-                    
-            elif category == 'market_indicators':
-                analysis['found_market'] = list(set(matches))[:10]
-                analysis['significance_score'] += len(matches) * 3
-                if matches:
-                    analysis['change_type'] = 'market_update'
-                    analysis['confidence'] = 70
-                    
-            elif category == 'social_indicators':
-                analysis['found_social'] = list(set(matches))[:10]
-                analysis['significance_score'] += len(matches) * 2
-                if matches:
-                    analysis['change_type'] = 'social_update'
-                    analysis['confidence'] = 60
-        
-        # High-value terms boost
-        high_value_terms = [
-            'toty', 'tots', 'icon', 'hero', 'flashback', 'fut champions', 
-            'lightning round', 'beta', 'new feature', 'evolution', 'academy',
-            'weekend league', 'division rivals', 'squad battles', 'rewards',
-            'promo', 'special card', 'limited time', 'pack odds'
-        ]
-        
-        content_lower = content.lower()
-        value_boost = 0
-        for term in high_value_terms:
-            if term in content_lower:
-                value_boost += 8
-                analysis['confidence'] = min(95, analysis['confidence'] + 8)
+        if len(content) < ANALYSIS_OFFLOAD_CHARS:
+            return analyze_text(content, self._compiled_patterns)
         
-        analysis['significance_score'] += value_boost
-        
-        # JavaScript/config file specific boosts
-        if any(indicator in content_lower for indicator in ['api/', 'endpoint', 'url:', 'config', 'auth']):
-            analysis['significance_score'] += 4
-            if analysis['change_type'] == 'unknown':
-                analysis['change_type'] = 'config_update'
-
-        # Endpoint-specific boosts (by content hints)
-        endpoint_indicators = {
-            'academy': 12,   # Evolutions/Academy
-            'champs': 10,    # FUT Champs
-            'sbs': 10,       # SBCs
-            'rivals': 8,     # Division Rivals
-            'featured': 8,   # Featured squads/TOTW
-            'store': 7,      # Store
-            'tradepile': 5,  # Market activity
-            'squad': 4,      # Squad management
-            'social': 3,     # Social
-            'appstats': 5,
-            'attributes/metadata': 6,
-            'setid': 6
-        }
-        for indicator, boost in endpoint_indicators.items():
-            if indicator in content_lower:
-                analysis['significance_score'] += boost
-                analysis['confidence'] = min(95, analysis['confidence'] + 5)
-
-        # Final: ensure a concrete change_type and clamp confidence
-        if analysis['change_type'] == 'unknown':
-            analysis['change_type'] = 'config_update'
-        analysis['confidence'] = min(100, analysis['confidence'])
-
-        return analysis
+        # Large bundles (main.js, vendor.js) take long enough to stall every other
+        # check and the web handlers, so they are analysed in a worker process
+        if self._analysis_pool is None:
+            self._analysis_pool = ProcessPoolExecutor(
+                max_workers=2, mp_context=multiprocessing.get_context('spawn')
+            )
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._analysis_pool, analyze_text, content, self._compiled_patterns
+            )
+        except BrokenProcessPool as e:
+            logging.error(f"Analysis worker failed, analysing in a thread: {e}")
+            # Release the broken pool's resources; the next large body starts a fresh one
+            self._analysis_pool.shutdown(wait=False)
+            self._analysis_pool = None
+            return await asyncio.to_thread(analyze_text, content, self._compiled_patterns)
 
     async def save_to_database(self, change_data: Dict):
         """Save change to database"""
+        await asyncio.to_thread(self.write_change, change_data)
+
+    def write_change(self, change_data: Dict):
+        """Insert one change row; runs in a worker thread"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connect_db() as conn:
                 conn.execute('''
                     INSERT INTO changes 
                     (timestamp, endpoint, change_type, significance_score, content_hash, extracted_data, status_code)
@@ -849,8 +1002,8 @@ class RailwayEAFCDataMiner:
                     change_data['endpoint'],
                     change_data['analysis']['change_type'],
                     change_data['analysis']['significance_score'],
-                    self.get_file_hash(str(change_data['analysis'])),
-                    json.dumps(change_data['analysis']),
+                    change_data['content_hash'],
+                    dump_json(change_data['analysis']),
                     change_data['status_code']
                 ))
         except Exception as e:
@@ -937,6 +1090,36 @@ class RailwayEAFCDataMiner:
         return None
 
     # ---------- Server Loop ----------
+    async def run_cycle(self) -> List[Dict]:
+        """Check every endpoint once, a few at a time, and return the detected changes"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+
+        async def bounded_check(name: str, url_or_cfg: Union[str, dict]) -> Optional[Dict]:
+            url = url_or_cfg.get("url") if isinstance(url_or_cfg, dict) else url_or_cfg
+            host = urlsplit(url or "").netloc
+            while True:
+                # Sit out a rate-limited host's backoff without holding a slot
+                delay = self._host_backoff.get(host, 0) - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                async with semaphore:
+                    if not self.running:
+                        return None
+                    # Another check may have been rate limited while this one queued
+                    if self._host_backoff.get(host, 0) > time.monotonic():
+                        continue
+                    return await self.check_endpoint(name, url_or_cfg)
+
+        results = await asyncio.gather(
+            *(bounded_check(name, url) for name, url in self.endpoints.items()),
+            return_exceptions=True
+        )
+        await self.flush_known_hashes()
+        for name, result in zip(self.endpoints, results):
+            if isinstance(result, Exception):
+                logging.error(f"💥 Error checking {name}: {result}")
+        return [result for result in results if isinstance(result, dict)]
+
     async def monitoring_loop(self):
         """Main monitoring loop"""
         await self.initialize_session()
@@ -951,15 +1134,7 @@ class RailwayEAFCDataMiner:
                 cycle_count += 1
                 logging.info(f"🔄 Cycle {cycle_count} starting...")
                 
-                changes_detected = []
-                
-                # Check all endpoints
-                for name, url in self.endpoints.items():
-                    if not self.running:
-                        break
-                    change_data = await self.check_endpoint(name, url)
-                    if change_data:
-                        changes_detected.append(change_data)
+                changes_detected = await self.run_cycle()
                 
                 if changes_detected:
                     high_sig = len([c for c in changes_detected if c['analysis']['significance_score'] > 10])
@@ -973,8 +1148,13 @@ class RailwayEAFCDataMiner:
         except Exception as e:
             logging.error(f"💥 Monitoring loop error: {e}")
         finally:
+            await self.flush_known_hashes()
             if self.session:
                 await self.session.close()
+            if self._analysis_pool is not None:
+                # Waiting for the workers blocks, so it happens off the event loop
+                await asyncio.to_thread(self._analysis_pool.shutdown)
+                self._analysis_pool = None
 
     # ---------- HTTP Handlers ----------
     async def health_check_handler(self, request):
@@ -986,12 +1166,27 @@ class RailwayEAFCDataMiner:
             'changes_detected': len(self.changes_log),
             'running': self.running,
             'check_interval_minutes': self.check_interval // 60
-        })
+        }, dumps=dump_json)
 
     async def stats_handler(self, request):
         """Stats endpoint"""
+        # Reuse the serialized body for a short while (or until a change lands);
+        # clients that send back its ETag get a bodiless 304
+        now = time.monotonic()
+        if self._stats_cache is None or now >= self._stats_cache[0]:
+            body = dump_json(self.build_stats())
+            etag = f'"{hashlib.sha1(body.encode("utf-8")).hexdigest()[:16]}"'
+            self._stats_cache = (now + self.stats_ttl, etag, body)
+        _, etag, body = self._stats_cache
+        
+        if etag_matches(request.headers.get('If-None-Match'), etag):
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(text=body, content_type='application/json', headers={'ETag': etag})
+
+    def build_stats(self) -> Dict:
+        """Collect the /stats payload"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connect_db() as conn:
                 recent_changes = conn.execute(
                     "SELECT COUNT(*) FROM changes WHERE timestamp > datetime('now', '-24 hours')"
                 ).fetchone()[0]
@@ -1013,24 +1208,24 @@ class RailwayEAFCDataMiner:
             high_sig_changes = 0
             endpoint_stats = []
         
-        return web.json_response({
+        return {
             'recent_changes_24h': recent_changes,
             'high_significance_changes_24h': high_sig_changes,
             'endpoints_monitored': len(self.endpoints),
             'check_interval_minutes': self.check_interval // 60,
             'endpoint_status_summary': [{"endpoint": row[0], "status": row[1], "checks": row[2]} for row in endpoint_stats],
-            'last_changes': self.changes_log[-5:] if self.changes_log else [],
+            'last_changes': list(islice(self.changes_log, max(0, len(self.changes_log) - 5), None)),
             'thresholds': {
                 'high': self.high_threshold,
                 'medium': self.medium_threshold,
                 'low': self.low_threshold
             }
-        })
+        }
 
     async def changes_handler(self, request):
         """Web interface to view detected changes"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connect_db() as conn:
                 changes = conn.execute("""
                     SELECT timestamp, endpoint, change_type, significance_score, extracted_data
                     FROM changes 
@@ -1147,7 +1342,10 @@ class RailwayEAFCDataMiner:
         </html>
         """
         
-        return web.Response(text=html, content_type='text/html')
+        # The page is mostly repeated markup, so it compresses well for clients that accept it
+        response = web.Response(text=html, content_type='text/html')
+        response.enable_compression()
+        return response
 
     def _render_changes_html(self, changes):
         """Render changes as HTML"""
@@ -1159,7 +1357,7 @@ class RailwayEAFCDataMiner:
             timestamp, endpoint, change_type, score, extracted_data = change
             
             try:
-                analysis = json.loads(extracted_data) if extracted_data else {}
+                analysis = load_json(extracted_data) if extracted_data else {}
             except:
                 analysis = {}
             
@@ -1196,9 +1394,9 @@ class RailwayEAFCDataMiner:
             if score >= 15 and (analysis.get('found_sbcs') or analysis.get('found_promos')):
                 samples = []
                 if analysis.get('found_sbcs'):
-                    samples.extend([f"🏆 {sbc}" for sbc in analysis['found_sbcs'][:3]])
+                    samples.extend([f"🏆 {escape(str(sbc))}" for sbc in analysis['found_sbcs'][:3]])
                 if analysis.get('found_promos'):
-                    samples.extend([f"🎉 {promo}" for promo in analysis['found_promos'][:3]])
+                    samples.extend([f"🎉 {escape(str(promo))}" for promo in analysis['found_promos'][:3]])
                 
                 if samples:
                     sample_preview = f'<div style="margin-top: 10px; padding: 10px; background: rgba(255,255,255,0.05); border-radius: 5px; font-size: 13px;">{"<br>".join(samples[:5])}</div>'
@@ -1207,7 +1405,7 @@ class RailwayEAFCDataMiner:
             <div class="change-item {priority_class}">
                 <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
                     <div>
-                        <strong style="color: #00d4ff;">{endpoint}</strong>
+                        <strong style="color: #00d4ff;">{escape(endpoint)}</strong>
                         <span style="margin-left: 15px; color: #888;">Priority: {priority_text}</span>
                     </div>
                     <span class="score">Score: {score}</span>
@@ -1244,7 +1442,7 @@ class RailwayEAFCDataMiner:
             <div class="content-item {type_class}">
                 <div style="display: flex; align-items: center; margin-bottom: 8px;">
                     <span style="font-size: 1.2em; margin-right: 8px;">{icon}</span>
-                    <strong style="color: #fff;">{name}</strong>
+                    <strong style="color: #fff;">{escape(name)}</strong>
                 </div>
                 <div class="timestamp">{timestamp}</div>
                 <div style="margin-top: 5px;">
@@ -1255,7 +1453,7 @@ class RailwayEAFCDataMiner:
                         {confidence}% confidence
                     </span>
                 </div>
-                <div style="font-size: 12px; color: #888; margin-top: 8px;">Source: {endpoint}</div>
+                <div style="font-size: 12px; color: #888; margin-top: 8px;">Source: {escape(str(endpoint))}</div>
             </div>
             """)
         
@@ -1308,6 +1506,9 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if HAS_UVLOOP:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logging.info("🏁 DataMiner stopped")